@@ -8,53 +8,144 @@ Version: 1.0.0
 """
 
 # External imports with version specifications
-from fastapi import FastAPI  # version: 0.95.0
+from fastapi import FastAPI, Response  # version: 0.95.0
 from fastapi.middleware.cors import CORSMiddleware  # version: 0.95.0
-from fastapi.responses import JSONResponse  # version: 0.95.0
+from fastapi.middleware.gzip import GZipMiddleware  # version: 0.95.0
+from starlette.middleware.gzip import GZipResponder  # version: 0.27.0
+from fastapi.responses import ORJSONResponse  # version: 0.95.0
+from starlette.datastructures import Headers, MutableHeaders  # version: 0.27.0
+from starlette.types import ASGIApp, Message, Receive, Scope, Send  # version: 0.27.0
 import logging  # built-in
 import uvicorn  # version: 0.21.1
-from prometheus_client import Counter, Histogram, generate_latest  # version: 0.16.0
+from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST  # version: 0.16.0
 import structlog  # version: 23.1.0
+import orjson  # version: 3.9.10
+import asyncio
+import os
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 # Internal imports
-from .controllers.story_controller import router as story_router
-from .controllers.illustration_controller import router as illustration_router
+from .controllers.story_controller import router as story_router, get_story_status
+from .controllers.illustration_controller import (
+    router as illustration_router,
+    get_health_status as get_illustration_health
+)
 from .utils.error_handler import handle_openai_error, handle_stable_diffusion_error
-from .config import AIServiceConfig
+from .config import ENVIRONMENT, ENVIRONMENT_CONFIG, get_openai_config
+from .utils.context import request_id_var, new_request_id, inject_request_id
+from .utils.cache import cached, HEALTH_CACHE_TTL
+from .utils.executor import get_upstream_pool, shutdown_upstream_pool
 
 # Initialize FastAPI app with metadata
 app = FastAPI(
     title='Memorable AI Service',
     version='1.0.0',
     docs_url='/api/docs',
-    redoc_url='/api/redoc'
+    redoc_url='/api/redoc',
+    default_response_class=ORJSONResponse
 )
 
 # Initialize structured logging
 logger = structlog.get_logger(__name__)
 
-# Initialize configuration
-config = AIServiceConfig()
-
 # Initialize metrics
 REQUEST_COUNT = Counter('ai_service_requests_total', 'Total requests processed')
 REQUEST_LATENCY = Histogram('ai_service_request_latency_seconds', 'Request latency')
 ERROR_COUNT = Counter('ai_service_errors_total', 'Total errors encountered')
 
+# Plain running totals mirroring the metrics above for the health payload;
+# updated only from the event loop, so no locking is needed
+_req_count: int = 0
+_err_count: int = 0
+_latency_sum: float = 0.0
+_latency_count: int = 0
+
+# Latest Prometheus exposition as (monotonic timestamp, bytes), refreshed by a
+# background task and re-rendered on scrape if it ever goes stale
+METRICS_REFRESH_INTERVAL = 1.0  # seconds
+_metrics_cache: Tuple[float, bytes] = (0.0, b"")
+
+# Health check settings
+HEALTH_REFRESH_INTERVAL = 10.0  # seconds between background readiness refreshes
+HEALTH_PROBE_STORY_ID = '00000000-0000-0000-0000-000000000000'
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware binding the request ID and recording request metrics.
+    
+    Implemented as a raw ASGI middleware so each request pays for a single
+    middleware layer instead of one per concern.
+    """
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = Headers(scope=scope).get("x-request-id") or new_request_id()
+        request_id_var.set(request_id)
+        
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+        
+        global _req_count, _err_count, _latency_sum, _latency_count
+        REQUEST_COUNT.inc()
+        _req_count += 1
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception:
+            ERROR_COUNT.inc()
+            _err_count += 1
+            raise
+        latency = time.perf_counter() - start_time
+        REQUEST_LATENCY.observe(latency)
+        _latency_sum += latency
+        _latency_count += 1
+
+class _SkipImagesGZipResponder(GZipResponder):
+    """GZip responder passing already-compressed image bodies through untouched."""
+    
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith("image/"):
+                self.content_encoding_set = True
+
+class ResponseCompressionMiddleware(GZipMiddleware):
+    """GZip middleware for JSON responses that skips generated images."""
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            responder = _SkipImagesGZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
 def configure_logging() -> None:
     """Configure structured logging with correlation IDs and performance tracking."""
+    log_level = getattr(logging, ENVIRONMENT_CONFIG[ENVIRONMENT]['log_level'])
     structlog.configure(
         processors=[
+            structlog.contextvars.merge_contextvars,
+            inject_request_id,
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(serializer=orjson.dumps)
         ],
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
-        wrapper_class=structlog.BoundLogger,
+        logger_factory=structlog.BytesLoggerFactory(),
+        # Drop records below the configured level before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         cache_logger_on_first_use=True,
     )
 
@@ -69,27 +160,11 @@ def configure_middleware() -> None:
         allow_headers=["*"],
     )
 
-    # Request ID middleware
-    @app.middleware("http")
-    async def add_request_id(request, call_next):
-        request_id = request.headers.get("X-Request-ID", str(time.time()))
-        with structlog.contextvars.bound_contextvars(request_id=request_id):
-            response = await call_next(request)
-            response.headers["X-Request-ID"] = request_id
-            return response
-
-    # Performance monitoring middleware
-    @app.middleware("http")
-    async def monitor_requests(request, call_next):
-        REQUEST_COUNT.inc()
-        start_time = time.time()
-        try:
-            response = await call_next(request)
-            REQUEST_LATENCY.observe(time.time() - start_time)
-            return response
-        except Exception as e:
-            ERROR_COUNT.inc()
-            raise e
+    # Response compression for large JSON payloads
+    app.add_middleware(ResponseCompressionMiddleware, minimum_size=1024)
+
+    # Request ID and metrics middleware
+    app.add_middleware(RequestContextMiddleware)
 
 def configure_routes() -> None:
     """Configure API routes with versioning and documentation."""
@@ -108,49 +183,109 @@ def configure_routes() -> None:
     # Add metrics endpoint
     @app.get("/metrics")
     async def metrics():
+        global _metrics_cache
+        now = time.monotonic()
+        if now - _metrics_cache[0] > METRICS_REFRESH_INTERVAL:
+            _metrics_cache = (now, generate_latest())
         return Response(
-            content=generate_latest(),
-            media_type="text/plain"
+            content=_metrics_cache[1],
+            media_type=CONTENT_TYPE_LATEST
         )
 
+async def _refresh_metrics() -> None:
+    """Periodically render the Prometheus exposition off the request path."""
+    global _metrics_cache
+    while True:
+        _metrics_cache = (time.monotonic(), generate_latest())
+        await asyncio.sleep(METRICS_REFRESH_INTERVAL)
+
+async def _compute_health() -> Dict[str, Any]:
+    """
+    Build the AI service health payload from upstream service status.
+    
+    Returns:
+        Dict[str, Any]: Detailed service health status
+    """
+    # Check OpenAI service
+    openai_response = await get_story_status(HEALTH_PROBE_STORY_ID)
+    openai_status = orjson.loads(openai_response.body)
+    
+    # Check Stable Diffusion service, sharing the illustration health cache
+    sd_payload, _ = await cached("illustrations", HEALTH_CACHE_TTL, get_illustration_health)
+    sd_status = orjson.loads(sd_payload)
+    
+    return {
+        "status": "healthy",
+        "version": app.version,
+        "services": {
+            "openai": openai_status.get("status", "unknown"),
+            "stable_diffusion": sd_status.get("status", "unknown")
+        },
+        "performance": {
+            "request_count": _req_count,
+            "error_rate": _err_count / _req_count if _req_count else 0,
+            "average_latency": _latency_sum / _latency_count if _latency_count else 0
+        }
+    }
+
+async def _refresh_health() -> None:
+    """Periodically refresh the cached readiness payload in the background."""
+    while True:
+        try:
+            await cached("ai", 0.0, _compute_health)
+        except Exception as e:
+            logger.warning("Background health refresh failed", error=str(e))
+        await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+
+@app.on_event("startup")
+async def start_background_tasks() -> None:
+    """Start background tasks keeping cached state warm."""
+    app.state.upstream_pool = get_upstream_pool()
+    app.state.metrics_task = asyncio.create_task(_refresh_metrics())
+    app.state.health_task = asyncio.create_task(_refresh_health())
+
+@app.on_event("shutdown")
+async def stop_background_tasks() -> None:
+    """Cancel background tasks and release the upstream pool on shutdown."""
+    app.state.metrics_task.cancel()
+    app.state.health_task.cancel()
+    shutdown_upstream_pool()
+
+@app.get("/livez")
+async def liveness_check() -> ORJSONResponse:
+    """
+    Liveness probe performing no I/O.
+    
+    Returns:
+        ORJSONResponse: Static OK status
+    """
+    return ORJSONResponse(
+        content={"status": "ok"},
+        headers={"Cache-Control": "no-store"}
+    )
+
 @app.get("/health")
-async def health_check() -> JSONResponse:
+async def health_check() -> Response:
     """
-    Comprehensive health check endpoint for the AI service.
+    Readiness endpoint reporting AI service and upstream health.
+    
+    Served from the payload kept fresh by the background refresh task; it is
+    only recomputed here if that task has stalled.
     
     Returns:
-        JSONResponse: Detailed service health status
+        Response: Detailed service health status
     """
     try:
-        # Check OpenAI service
-        openai_status = await story_router.get_story_status("test")
-        
-        # Check Stable Diffusion service
-        sd_status = await illustration_router.health_check()
-        
-        health_status = {
-            "status": "healthy",
-            "version": app.version,
-            "services": {
-                "openai": openai_status.get("status", "unknown"),
-                "stable_diffusion": sd_status.get("status", "unknown")
-            },
-            "performance": {
-                "request_count": REQUEST_COUNT._value.get(),
-                "error_rate": (ERROR_COUNT._value.get() / REQUEST_COUNT._value.get()) 
-                if REQUEST_COUNT._value.get() > 0 else 0,
-                "average_latency": REQUEST_LATENCY._sum.get() / REQUEST_LATENCY._count.get()
-                if REQUEST_LATENCY._count.get() > 0 else 0
-            }
-        }
+        payload, etag = await cached("ai", 2 * HEALTH_REFRESH_INTERVAL, _compute_health)
         
-        return JSONResponse(
-            content=health_status,
-            status_code=200
+        return Response(
+            content=payload,
+            media_type="application/json",
+            headers={"ETag": etag}
         )
     except Exception as e:
         logger.error("Health check failed", error=str(e))
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "status": "unhealthy",
                 "error": str(e)
@@ -169,9 +304,16 @@ def start_application() -> None:
 start_application()
 
 if __name__ == "__main__":
+    cfg = get_openai_config()
+    debug = cfg["debug"]
+    workers = 1 if debug else max(2, os.cpu_count() or 2)
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
         port=8000,
-        reload=config.get_config().get("debug", False)
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        access_log=debug,
+        reload=debug
     )
\ No newline at end of file
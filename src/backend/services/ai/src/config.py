@@ -9,7 +9,9 @@ Version: 1.0.0
 """
 
 import os
-from typing import Dict, Any, Optional, Union, Literal
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Union, Literal
 from dotenv import load_dotenv  # version: 1.0.0
 
 # Load environment variables
@@ -21,6 +23,12 @@ STABLE_DIFFUSION_API_KEY = os.getenv('STABLE_DIFFUSION_API_KEY', '')
 ENVIRONMENT: Literal['development', 'staging', 'production'] = os.getenv('ENVIRONMENT', 'development')
 CONFIG_VERSION = '1.0.0'
 
+# Content safety checks may only be switched off outside production
+CONTENT_SAFETY_ENABLED: bool = (
+    ENVIRONMENT == 'production'
+    or os.getenv('CONTENT_SAFETY_ENABLED', 'true').lower() != 'false'
+)
+
 # OpenAI Configuration Constants
 OPENAI_CONFIG: Dict[str, Any] = {
     'model': 'gpt-4',
@@ -44,7 +52,9 @@ STABLE_DIFFUSION_CONFIG: Dict[str, Any] = {
     'retry_attempts': 3,
     'retry_delay': 1.0,
     'safety_checker': True,
-    'optimization_level': 'memory'
+    'optimization_level': 'memory',
+    'enhance': True,  # Post-process generated images
+    'output_format': 'PNG'  # Book storage accepts PNG, JPEG and HEIF only
 }
 
 # Environment-specific Configuration
@@ -116,18 +126,18 @@ def validate_environment() -> bool:
     
     return True
 
+@lru_cache(maxsize=4)
 @validate_config
-def get_openai_config(env: Optional[str] = None) -> Dict[str, Any]:
+def _build_openai_config(environment: str) -> Mapping[str, Any]:
     """
-    Retrieves environment-specific OpenAI configuration settings.
+    Builds and validates the OpenAI configuration for an environment once.
     
     Args:
-        env: Optional environment override
+        environment: Environment name
     
     Returns:
-        Dict[str, Any]: Validated OpenAI configuration dictionary
+        Mapping[str, Any]: Read-only OpenAI configuration
     """
-    environment = env or ENVIRONMENT
     env_config = ENVIRONMENT_CONFIG[environment]
     
     config = OPENAI_CONFIG.copy()
@@ -139,20 +149,20 @@ def get_openai_config(env: Optional[str] = None) -> Dict[str, Any]:
         'performance_monitoring': env_config['performance_monitoring']
     })
     
-    return config
+    return MappingProxyType(config)
 
+@lru_cache(maxsize=4)
 @validate_config
-def get_stable_diffusion_config(env: Optional[str] = None) -> Dict[str, Any]:
+def _build_stable_diffusion_config(environment: str) -> Mapping[str, Any]:
     """
-    Retrieves environment-specific Stable Diffusion configuration.
+    Builds and validates the Stable Diffusion configuration for an environment once.
     
     Args:
-        env: Optional environment override
+        environment: Environment name
     
     Returns:
-        Dict[str, Any]: Validated Stable Diffusion configuration dictionary
+        Mapping[str, Any]: Read-only Stable Diffusion configuration
     """
-    environment = env or ENVIRONMENT
     env_config = ENVIRONMENT_CONFIG[environment]
     
     config = STABLE_DIFFUSION_CONFIG.copy()
@@ -164,7 +174,31 @@ def get_stable_diffusion_config(env: Optional[str] = None) -> Dict[str, Any]:
         'performance_monitoring': env_config['performance_monitoring']
     })
     
-    return config
+    return MappingProxyType(config)
+
+def get_openai_config(env: Optional[str] = None) -> Mapping[str, Any]:
+    """
+    Retrieves environment-specific OpenAI configuration settings.
+    
+    Args:
+        env: Optional environment override
+    
+    Returns:
+        Mapping[str, Any]: Validated, read-only OpenAI configuration
+    """
+    return _build_openai_config(env or ENVIRONMENT)
+
+def get_stable_diffusion_config(env: Optional[str] = None) -> Mapping[str, Any]:
+    """
+    Retrieves environment-specific Stable Diffusion configuration.
+    
+    Args:
+        env: Optional environment override
+    
+    Returns:
+        Mapping[str, Any]: Validated, read-only Stable Diffusion configuration
+    """
+    return _build_stable_diffusion_config(env or ENVIRONMENT)
 
 # Export configuration functions for service use
 __all__ = [
@@ -1,9 +1,11 @@
 # External imports with version specifications
-from fastapi import FastAPI, HTTPException, Response, Depends  # version: 0.95.0
-from fastapi.responses import JSONResponse, StreamingResponse  # version: 0.95.0
+from fastapi import FastAPI, HTTPException, Request, Response, Depends  # version: 0.95.0
+from fastapi.responses import StreamingResponse  # version: 0.95.0
 from fastapi import APIRouter  # version: 0.95.0
+import orjson  # version: 3.9.10
+import gzip
+import hashlib
 import logging
-import uuid
 import time
 from typing import Dict, Any
 
@@ -11,6 +13,8 @@ from typing import Dict, Any
 from ..models.illustration_request import IllustrationRequest
 from ..services.stable_diffusion_service import StableDiffusionService
 from ..utils.error_handler import handle_stable_diffusion_error, AIServiceError
+from ..utils.context import get_request_id
+from ..utils.cache import cached, HEALTH_CACHE_TTL
 from ..config import get_stable_diffusion_config, STABLE_DIFFUSION_CONFIG
 
 # Initialize router with prefix and tags
@@ -24,9 +28,67 @@ stable_diffusion_service = StableDiffusionService(get_stable_diffusion_config())
 
 # Constants
 CACHE_CONTROL = {'public': True, 'max-age': 3600}
-CONTENT_TYPE = 'image/png'
+CONTENT_TYPE = stable_diffusion_service.media_type
 PERFORMANCE_THRESHOLD = 45.0  # seconds, per technical spec
 
+# Static generation parameters, resolved once at import
+_BASE_RES = tuple(STABLE_DIFFUSION_CONFIG['base_resolution'])
+_MAX_RES_STR = f"{_BASE_RES[0]}x{_BASE_RES[1]}"
+_GUIDANCE = STABLE_DIFFUSION_CONFIG['guidance_scale']
+_STYLE_PARAMS: Dict[str, Any] = {
+    "base_resolution": _BASE_RES,
+    "guidance_scale": _GUIDANCE
+}
+_HEALTH_LIMITS: Dict[str, Any] = {
+    'max_resolution': _MAX_RES_STR,
+    'timeout': STABLE_DIFFUSION_CONFIG['timeout']
+}
+
+# Supported styles payload, static for the lifetime of the process
+STYLES_INFO: Dict[str, Any] = {
+    "children's book": {
+        "description": "Whimsical and engaging illustrations suitable for children",
+        "parameters": _STYLE_PARAMS,
+        "example_prompt": "A friendly dragon reading books to forest animals"
+    },
+    "watercolor": {
+        "description": "Soft, artistic watercolor painting style",
+        "parameters": _STYLE_PARAMS,
+        "example_prompt": "A serene forest scene with gentle watercolor effects"
+    },
+    "digital art": {
+        "description": "Modern digital art with clean lines and vibrant colors",
+        "parameters": _STYLE_PARAMS,
+        "example_prompt": "A futuristic cityscape with neon accents"
+    },
+    "cartoon": {
+        "description": "Bold, expressive cartoon style illustrations",
+        "parameters": _STYLE_PARAMS,
+        "example_prompt": "A playful cartoon character jumping with joy"
+    },
+    "realistic": {
+        "description": "Photorealistic style with natural details",
+        "parameters": _STYLE_PARAMS,
+        "example_prompt": "A detailed portrait with natural lighting"
+    }
+}
+
+# Serialize and compress the styles payload once, with a strong ETag per encoding
+_STYLES_BYTES: bytes = orjson.dumps({'styles': STYLES_INFO})
+_STYLES_GZIP_BYTES: bytes = gzip.compress(_STYLES_BYTES)
+_STYLES_DIGEST: str = hashlib.blake2b(_STYLES_BYTES, digest_size=8).hexdigest()
+_STYLES_HEADERS: Dict[str, str] = {
+    'Cache-Control': f"public, max-age={CACHE_CONTROL['max-age']}",
+    'ETag': f'"{_STYLES_DIGEST}"',
+    'Vary': 'Accept-Encoding',
+    'X-Version': STABLE_DIFFUSION_CONFIG['model']
+}
+_STYLES_GZIP_HEADERS: Dict[str, str] = {
+    **_STYLES_HEADERS,
+    'Content-Encoding': 'gzip',
+    'ETag': f'"{_STYLES_DIGEST}-gzip"'
+}
+
 @router.post('/generate')
 @handle_stable_diffusion_error
 async def generate_illustration(request: IllustrationRequest) -> Response:
@@ -42,8 +104,8 @@ async def generate_illustration(request: IllustrationRequest) -> Response:
     Raises:
         HTTPException: On generation failure or timeout
     """
-    correlation_id = str(uuid.uuid4())
-    start_time = time.time()
+    correlation_id = get_request_id()
+    start_time = time.perf_counter()
     
     logger.info(f"Processing illustration request", extra={
         'correlation_id': correlation_id,
@@ -57,7 +119,7 @@ async def generate_illustration(request: IllustrationRequest) -> Response:
         image_data = await stable_diffusion_service.generate_illustration(request)
         
         # Calculate and log performance metrics
-        generation_time = time.time() - start_time
+        generation_time = time.perf_counter() - start_time
         logger.info(f"Illustration generated successfully", extra={
             'correlation_id': correlation_id,
             'generation_time': generation_time,
@@ -86,117 +148,83 @@ async def generate_illustration(request: IllustrationRequest) -> Response:
         )
         
     except Exception as e:
+        elapsed_time = time.perf_counter() - start_time
         logger.error(f"Illustration generation failed", extra={
             'correlation_id': correlation_id,
             'error': str(e),
-            'elapsed_time': time.time() - start_time
-        })
-        raise handle_stable_diffusion_error(e, {
-            'correlation_id': correlation_id,
-            'start_time': start_time
+            'elapsed_time': elapsed_time
         })
+        raise
 
 @router.get('/styles')
 @handle_stable_diffusion_error
-async def get_supported_styles() -> JSONResponse:
+async def get_supported_styles(request: Request) -> Response:
     """
     Retrieve supported illustration styles with detailed information.
     
+    The payload is static, so it is served from pre-serialized (and, when
+    accepted, pre-compressed) bytes and revalidated with a strong ETag.
+    
+    Args:
+        request (Request): Incoming request, used for conditional headers
+        
     Returns:
-        JSONResponse: List of supported styles with examples and parameters
+        Response: List of supported styles with examples and parameters
     """
-    try:
-        styles_info = {
-            "children's book": {
-                "description": "Whimsical and engaging illustrations suitable for children",
-                "parameters": {
-                    "base_resolution": STABLE_DIFFUSION_CONFIG['base_resolution'],
-                    "guidance_scale": STABLE_DIFFUSION_CONFIG['guidance_scale']
-                },
-                "example_prompt": "A friendly dragon reading books to forest animals"
-            },
-            "watercolor": {
-                "description": "Soft, artistic watercolor painting style",
-                "parameters": {
-                    "base_resolution": STABLE_DIFFUSION_CONFIG['base_resolution'],
-                    "guidance_scale": STABLE_DIFFUSION_CONFIG['guidance_scale']
-                },
-                "example_prompt": "A serene forest scene with gentle watercolor effects"
-            },
-            "digital art": {
-                "description": "Modern digital art with clean lines and vibrant colors",
-                "parameters": {
-                    "base_resolution": STABLE_DIFFUSION_CONFIG['base_resolution'],
-                    "guidance_scale": STABLE_DIFFUSION_CONFIG['guidance_scale']
-                },
-                "example_prompt": "A futuristic cityscape with neon accents"
-            },
-            "cartoon": {
-                "description": "Bold, expressive cartoon style illustrations",
-                "parameters": {
-                    "base_resolution": STABLE_DIFFUSION_CONFIG['base_resolution'],
-                    "guidance_scale": STABLE_DIFFUSION_CONFIG['guidance_scale']
-                },
-                "example_prompt": "A playful cartoon character jumping with joy"
-            },
-            "realistic": {
-                "description": "Photorealistic style with natural details",
-                "parameters": {
-                    "base_resolution": STABLE_DIFFUSION_CONFIG['base_resolution'],
-                    "guidance_scale": STABLE_DIFFUSION_CONFIG['guidance_scale']
-                },
-                "example_prompt": "A detailed portrait with natural lighting"
-            }
-        }
-        
-        headers = {
-            'Cache-Control': f"public, max-age={CACHE_CONTROL['max-age']}",
-            'X-Version': STABLE_DIFFUSION_CONFIG['model']
-        }
-        
-        return JSONResponse(
-            content={'styles': styles_info},
-            headers=headers
-        )
-        
-    except Exception as e:
-        logger.error(f"Failed to retrieve styles: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to retrieve illustration styles"
-        )
+    if 'gzip' in request.headers.get('accept-encoding', ''):
+        content, headers = _STYLES_GZIP_BYTES, _STYLES_GZIP_HEADERS
+    else:
+        content, headers = _STYLES_BYTES, _STYLES_HEADERS
+    
+    if request.headers.get('if-none-match') == headers['ETag']:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(
+        content=content,
+        media_type='application/json',
+        headers=headers
+    )
+
+async def get_health_status() -> Dict[str, Any]:
+    """
+    Build the illustration service health payload from upstream status.
+    
+    Returns:
+        Dict[str, Any]: Service health status and performance metrics
+    """
+    service_status = await stable_diffusion_service.get_service_status()
+    
+    return {
+        'status': 'healthy' if service_status['available'] else 'degraded',
+        'model': STABLE_DIFFUSION_CONFIG['model'],
+        'version': STABLE_DIFFUSION_CONFIG.get('version', '1.0.0'),
+        'metrics': {
+            'average_response_time': service_status.get('avg_response_time', 0),
+            'requests_per_minute': service_status.get('requests_per_minute', 0),
+            'error_rate': service_status.get('error_rate', 0)
+        },
+        'limits': _HEALTH_LIMITS
+    }
 
 @router.get('/health')
 @handle_stable_diffusion_error
-async def health_check() -> JSONResponse:
+async def health_check() -> Response:
     """
     Check illustration service health with detailed metrics.
     
+    Upstream status is cached briefly so load balancer probes do not each
+    trigger an upstream call.
+    
     Returns:
-        JSONResponse: Service health status and performance metrics
+        Response: Service health status and performance metrics
     """
     try:
-        # Get service status and metrics
-        service_status = await stable_diffusion_service.get_service_status()
-        
-        health_info = {
-            'status': 'healthy' if service_status['available'] else 'degraded',
-            'model': STABLE_DIFFUSION_CONFIG['model'],
-            'version': STABLE_DIFFUSION_CONFIG.get('version', '1.0.0'),
-            'metrics': {
-                'average_response_time': service_status.get('avg_response_time', 0),
-                'requests_per_minute': service_status.get('requests_per_minute', 0),
-                'error_rate': service_status.get('error_rate', 0)
-            },
-            'limits': {
-                'max_resolution': f"{STABLE_DIFFUSION_CONFIG['base_resolution'][0]}x{STABLE_DIFFUSION_CONFIG['base_resolution'][1]}",
-                'timeout': STABLE_DIFFUSION_CONFIG['timeout']
-            }
-        }
+        payload, etag = await cached('illustrations', HEALTH_CACHE_TTL, get_health_status)
         
-        return JSONResponse(
-            content=health_info,
-            headers={'Cache-Control': 'no-cache'}
+        return Response(
+            content=payload,
+            media_type='application/json',
+            headers={'Cache-Control': 'no-cache', 'ETag': etag}
         )
         
     except Exception as e:
@@ -207,4 +235,4 @@ async def health_check() -> JSONResponse:
         )
 
 # Export router for FastAPI application
-__all__ = ['router']
\ No newline at end of file
+__all__ = ['router', 'get_health_status']
\ No newline at end of file
@@ -9,19 +9,20 @@ Version: 1.0.0
 
 # External imports with version specifications
 from fastapi import APIRouter, HTTPException, Depends  # version: 0.95.0
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import logging
+import re
 import time
 from typing import Dict, Any, Optional
 from functools import wraps
-import uuid
 
 # Internal imports
 from ..models.story_request import StoryRequest
 from ..services.openai_service import OpenAIService
 from ..utils.error_handler import AIServiceError, handle_openai_error
-from ..utils.validators import validate_string, ContentValidator
-from ..config import get_openai_config
+from ..utils.validators import ContentValidator
+from ..utils.context import get_request_id
+from ..config import get_openai_config, CONTENT_SAFETY_ENABLED
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -32,18 +33,21 @@ router = APIRouter(prefix='/api/v1/stories', tags=['stories'])
 # Initialize content validator
 content_validator = ContentValidator()
 
+# Story IDs are UUIDs in canonical 8-4-4-4-12 form
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+
 def monitor_performance(func):
     """Decorator for monitoring endpoint performance."""
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        request_id = str(uuid.uuid4())
-        start_time = time.time()
+        request_id = get_request_id()
+        start_time = time.perf_counter()
         
         try:
             result = await func(*args, **kwargs)
             
             # Log performance metrics
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             logger.info("Story generation completed", extra={
                 "request_id": request_id,
                 "execution_time": execution_time,
@@ -53,7 +57,7 @@ def monitor_performance(func):
             return result
         except Exception as e:
             # Log error metrics
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             logger.error("Story generation failed", extra={
                 "request_id": request_id,
                 "execution_time": execution_time,
@@ -64,37 +68,46 @@ def monitor_performance(func):
             
     return wrapper
 
-def validate_request(func):
-    """Decorator for comprehensive request validation."""
-    @wraps(func)
-    async def wrapper(request: StoryRequest, *args, **kwargs):
-        try:
-            # Validate request using StoryRequest model
-            request.validate()
-            
-            # Additional content safety validation
-            safety_result = content_validator.validate_story_prompt(
-                f"{request.character_name} {request.theme} {' '.join(request.interests)}"
-            )
-            if not safety_result.is_valid:
-                raise AIServiceError(
-                    message="Content safety check failed",
-                    details=safety_result.details,
-                    request_id=str(uuid.uuid4())
-                )
-            
-            return await func(request, *args, **kwargs)
-        except AIServiceError as e:
-            logger.error("Request validation failed", extra={
-                "error": str(e),
-                "details": e.details
-            })
-            raise HTTPException(
-                status_code=400,
-                detail=e.to_dict()
-            )
-            
-    return wrapper
+async def check_content_safety(request: StoryRequest) -> StoryRequest:
+    """
+    Dependency running the content safety check on a story request.
+    
+    Field validation already ran when the request body was parsed, so only
+    the content safety check remains here.
+    
+    Args:
+        request (StoryRequest): Parsed story generation request
+        
+    Returns:
+        StoryRequest: The request, unchanged
+        
+    Raises:
+        HTTPException: If the content safety check fails
+    """
+    if not CONTENT_SAFETY_ENABLED:
+        return request
+    
+    # StoryRequest already NFKC-normalized its fields when it was built
+    safety_result = content_validator.validate_story_fields(
+        request.character_name, request.theme, request.interests,
+        already_normalized=True
+    )
+    if not safety_result.is_valid:
+        error = AIServiceError(
+            message="Content safety check failed",
+            details=safety_result.details,
+            request_id=get_request_id()
+        )
+        logger.error("Request validation failed", extra={
+            "error": str(error),
+            "details": error.details
+        })
+        raise HTTPException(
+            status_code=400,
+            detail=error.to_dict()
+        )
+    
+    return request
 
 class StoryController:
     """Controller handling story generation endpoints."""
@@ -125,11 +138,29 @@ class StoryController:
             }
         }
 
+# Shared controller instance, built on the first request so importing the
+# router does not construct the OpenAI client
+_controller: Optional[StoryController] = None
+
+def _get_controller() -> StoryController:
+    """
+    Returns the shared story controller, building it on first use.
+    
+    Returns:
+        StoryController: Shared controller instance
+    """
+    global _controller
+    if _controller is None:
+        _controller = StoryController()
+    return _controller
+
+# Decorators apply innermost-first: the content safety dependency runs before
+# the handler, handle_openai_error maps upstream failures to HTTP errors, and
+# monitor_performance times the whole call including that mapping.
 @router.post('/generate')
 @monitor_performance
-@validate_request
 @handle_openai_error
-async def generate_story(request: StoryRequest) -> JSONResponse:
+async def generate_story(request: StoryRequest = Depends(check_content_safety)) -> ORJSONResponse:
     """
     Generate a personalized children's story based on provided parameters.
     
@@ -137,55 +168,40 @@ async def generate_story(request: StoryRequest) -> JSONResponse:
         request (StoryRequest): Validated story generation request
         
     Returns:
-        JSONResponse: Generated story with comprehensive metadata
+        ORJSONResponse: Generated story with comprehensive metadata
         
     Raises:
         HTTPException: If story generation fails or validation errors occur
     """
-    controller = StoryController()
-    request_id = str(uuid.uuid4())
+    controller = _get_controller()
+    request_id = get_request_id()
     
-    try:
-        logger.info("Starting story generation", extra={
-            "request_id": request_id,
-            "theme": request.theme,
-            "age": request.age
-        })
-        
-        # Generate story content
-        story_content = await controller._openai_service.generate_story(request)
-        
-        # Format response with metadata
-        response = await controller.format_response(story_content)
-        
-        logger.info("Story generation successful", extra={
-            "request_id": request_id,
-            "generation_time": story_content["metadata"]["generation_time"],
-            "tokens_used": story_content["metadata"]["tokens_used"]
-        })
-        
-        return JSONResponse(
-            content=response,
-            status_code=200
-        )
-        
-    except Exception as e:
-        logger.error("Story generation failed", extra={
-            "request_id": request_id,
-            "error": str(e)
-        })
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "error": "Story generation failed",
-                "message": str(e),
-                "request_id": request_id
-            }
-        )
+    logger.info("Starting story generation", extra={
+        "request_id": request_id,
+        "theme": request.theme,
+        "age": request.age
+    })
+    
+    # Generate story content
+    story_content = await controller._openai_service.generate_story(request)
+    
+    # Format response with metadata
+    response = await controller.format_response(story_content)
+    
+    logger.info("Story generation successful", extra={
+        "request_id": request_id,
+        "generation_time": story_content["metadata"]["generation_time"],
+        "tokens_used": story_content["metadata"]["tokens_used"]
+    })
+    
+    return ORJSONResponse(
+        content=response,
+        status_code=200
+    )
 
 @router.get('/{story_id}/status')
 @monitor_performance
-async def get_story_status(story_id: str) -> JSONResponse:
+async def get_story_status(story_id: str) -> ORJSONResponse:
     """
     Get the status of a story generation request.
     
@@ -193,15 +209,22 @@ async def get_story_status(story_id: str) -> JSONResponse:
         story_id (str): Unique story generation request ID
         
     Returns:
-        JSONResponse: Story generation status with progress information
+        ORJSONResponse: Story generation status with progress information
     """
+    # Validate story_id format
+    if not _UUID_RE.fullmatch(story_id):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid story_id",
+                "story_id": story_id
+            }
+        )
+    
     try:
-        # Validate story_id format
-        validate_string(story_id, min_length=36, max_length=36)
-        
         # Mock status response for now
         # In production, this would check a cache or database
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "status": "completed",
                 "progress": 100,
@@ -211,11 +234,6 @@ async def get_story_status(story_id: str) -> JSONResponse:
             status_code=200
         )
         
-    except AIServiceError as e:
-        raise HTTPException(
-            status_code=400,
-            detail=e.to_dict()
-        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -1,6 +1,6 @@
 # External imports with version specifications
 from pydantic import BaseModel, Field, validator  # version: 1.10.0
-from typing import Tuple, List, Optional
+from typing import Dict, Tuple, List, Optional
 import re
 
 # Internal imports
@@ -14,6 +14,8 @@ SUPPORTED_STYLES: List[str] = [
     "cartoon",
     "realistic"
 ]
+_STYLE_LOOKUP: Dict[str, str] = {s.lower(): s for s in SUPPORTED_STYLES}
+_SUPPORTED_STYLES_TUPLE: Tuple[str, ...] = tuple(SUPPORTED_STYLES)
 
 MAX_PROMPT_LENGTH: int = 1000
 MIN_PROMPT_LENGTH: int = 10
@@ -21,6 +23,17 @@ DEFAULT_SIZE: Tuple[int, int] = (512, 512)
 MIN_IMAGE_DIMENSION: int = 256
 MAX_IMAGE_DIMENSION: int = 1024
 UNSAFE_PATTERN: str = r'[<>&;{}\[\]\\]'
+UNSAFE_RE: re.Pattern = re.compile(UNSAFE_PATTERN)
+_UNSAFE_CHARS: frozenset = frozenset('<>&;{}[]\\')
+
+# HTML entity encoding applied in a single str.translate pass
+_ESC_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;'
+})
 
 def validate_string_length(value: str, min_length: int, max_length: int) -> str:
     """
@@ -64,19 +77,12 @@ def sanitize_string(value: str) -> str:
     Returns:
         str: Sanitized string
     """
-    # Remove unsafe characters
-    sanitized = re.sub(UNSAFE_PATTERN, '', value)
+    # Remove unsafe characters, skipping the regex for clean input
+    sanitized = value if _UNSAFE_CHARS.isdisjoint(value) else UNSAFE_RE.sub('', value)
     # Replace multiple spaces with single space
     sanitized = ' '.join(sanitized.split())
     # HTML encode special characters
-    sanitized = (
-        sanitized.replace('&', '&amp;')
-        .replace('<', '&lt;')
-        .replace('>', '&gt;')
-        .replace('"', '&quot;')
-        .replace("'", '&#x27;')
-    )
-    return sanitized.strip()
+    return sanitized.translate(_ESC_TABLE)
 
 def validate_image_dimensions(dimensions: Tuple[int, int]) -> Tuple[int, int]:
     """
@@ -180,18 +186,19 @@ class IllustrationRequest(BaseModel):
         Returns:
             str: Validated style
         """
-        if not value or value.lower() not in [s.lower() for s in SUPPORTED_STYLES]:
+        # Map to the correctly cased version
+        canonical = _STYLE_LOOKUP.get(value.lower()) if value else None
+        if canonical is None:
             raise AIServiceError(
                 message="Invalid illustration style",
                 details={
                     "provided_style": value,
-                    "supported_styles": SUPPORTED_STYLES
+                    "supported_styles": _SUPPORTED_STYLES_TUPLE
                 },
                 request_id="validation_error"
             )
         
-        # Return the correctly cased version
-        return next(s for s in SUPPORTED_STYLES if s.lower() == value.lower())
+        return canonical
 
     @validator('size')
     def validate_size(cls, value: Tuple[int, int]) -> Tuple[int, int]:
@@ -1,7 +1,7 @@
 # External imports with version specifications
-from dataclasses import dataclass  # built-in
+from dataclasses import dataclass, field  # built-in
 from typing import List, Optional  # built-in
-import re  # built-in
+import regex  # version: 2023.10.3
 import unicodedata
 
 # Internal imports
@@ -13,6 +13,8 @@ SUPPORTED_THEMES = [
     'Nature', 'Science', 'Space', 'Ocean',
     'Friendship', 'Family'
 ]
+_SUPPORTED_THEME_SET = frozenset(SUPPORTED_THEMES)
+_SUPPORTED_THEMES_TUPLE = tuple(SUPPORTED_THEMES)
 
 MAX_CHARACTER_NAME_LENGTH = 50
 MIN_AGE = 3  # COPPA compliance
@@ -20,11 +22,20 @@ MAX_AGE = 12
 MAX_INTERESTS = 5
 MAX_ADDITIONAL_NOTES_LENGTH = 500
 
-# Unicode-aware patterns for validation
-NAME_PATTERN = re.compile(r'^[\p{L}\s-]{1,50}$', re.UNICODE)
-INTEREST_PATTERN = re.compile(r'^[\p{L}\s-]{1,30}$', re.UNICODE)
+# Unicode-aware patterns for validation, compiled once and shared by all
+# instances (the stdlib re module has no \p{L} support)
+NAME_PATTERN = regex.compile(r'^[\p{L}\s-]{1,50}$')
+INTEREST_PATTERN = regex.compile(r'^[\p{L}\s-]{1,30}$')
 
-@dataclass
+# Unicode control characters (category C*: Cc, Cf, Cs, Co, Cn), compiled once
+_CONTROL_RE = regex.compile(r'\p{C}+')
+
+# Separator for sanitizing several strings in one pass; the batch pattern
+# matches every control character except the separator
+_BATCH_SEPARATOR = '\x00'
+_BATCH_CONTROL_RE = regex.compile(r'[^\P{C}\x00]+')
+
+@dataclass(slots=True)
 class StoryRequest:
     """
     Data model for story generation requests with comprehensive validation.
@@ -41,6 +52,8 @@ class StoryRequest:
     theme: str
     interests: List[str]
     additional_notes: Optional[str] = None
+    # Set once __post_init__ has validated the fields
+    _validated: bool = field(default=False, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """
@@ -51,13 +64,16 @@ class StoryRequest:
         """
         # Sanitize string inputs
         self.character_name = self.sanitize_input(self.character_name)
-        self.theme = self.sanitize_input(self.theme)
-        self.interests = [self.sanitize_input(interest) for interest in self.interests]
+        # Supported themes are already in sanitized form
+        if self.theme not in _SUPPORTED_THEME_SET:
+            self.theme = self.sanitize_input(self.theme)
+        # Interests are sanitized in the validate_interests pass
         if self.additional_notes:
             self.additional_notes = self.sanitize_input(self.additional_notes)
         
         # Validate all fields
         self.validate()
+        self._validated = True
 
     @staticmethod
     def sanitize_input(input_string: str) -> str:
@@ -73,13 +89,44 @@ class StoryRequest:
         if not isinstance(input_string, str):
             return str(input_string)
         
-        # Normalize Unicode characters
-        normalized = unicodedata.normalize('NFKC', input_string)
+        # Normalize Unicode characters; ASCII is already in NFKC form
+        if input_string.isascii():
+            normalized = input_string
+        else:
+            normalized = unicodedata.normalize('NFKC', input_string)
         # Remove control characters
-        sanitized = ''.join(char for char in normalized if unicodedata.category(char)[0] != 'C')
+        sanitized = _CONTROL_RE.sub('', normalized)
         # Strip whitespace and normalize spaces
         return ' '.join(sanitized.split())
 
+    @classmethod
+    def sanitize_many(cls, input_strings: List[str]) -> List[str]:
+        """
+        Sanitize several strings at once, as sanitize_input would one by one.
+        
+        The strings are joined with a separator and normalized, filtered and
+        whitespace-collapsed in one pass. Falls back to per-string sanitizing
+        for non-string items or inputs containing the separator.
+        
+        Args:
+            input_strings (List[str]): Raw input strings
+            
+        Returns:
+            List[str]: Sanitized and normalized strings
+        """
+        try:
+            joined = _BATCH_SEPARATOR.join(input_strings)
+        except TypeError:
+            return [cls.sanitize_input(value) for value in input_strings]
+        
+        if joined.count(_BATCH_SEPARATOR) != len(input_strings) - 1:
+            return [cls.sanitize_input(value) for value in input_strings]
+        
+        normalized = joined if joined.isascii() else unicodedata.normalize('NFKC', joined)
+        collapsed = ' '.join(_BATCH_CONTROL_RE.sub('', normalized).split())
+        # Collapsing leaves at most one space on either side of a separator
+        return [part.strip(' ') for part in collapsed.split(_BATCH_SEPARATOR)]
+
     def validate_character_name(self) -> bool:
         """
         Validate character name with Unicode support.
@@ -117,7 +164,7 @@ class StoryRequest:
         Raises:
             AIServiceError: If age validation fails
         """
-        if not isinstance(self.age, int):
+        if type(self.age) is not int:
             raise AIServiceError(
                 message="Age must be a number",
                 details={"field": "age", "type": type(self.age).__name__},
@@ -147,13 +194,13 @@ class StoryRequest:
                 request_id="validate_theme"
             )
         
-        if self.theme not in SUPPORTED_THEMES:
+        if self.theme not in _SUPPORTED_THEME_SET:
             raise AIServiceError(
                 message="Invalid theme selected",
                 details={
                     "field": "theme",
                     "value": self.theme,
-                    "supported_themes": SUPPORTED_THEMES
+                    "supported_themes": _SUPPORTED_THEMES_TUPLE
                 },
                 request_id="validate_theme"
             )
@@ -167,7 +214,7 @@ class StoryRequest:
         Raises:
             AIServiceError: If interests validation fails
         """
-        if not isinstance(self.interests, list):
+        if type(self.interests) is not list:
             raise AIServiceError(
                 message="Interests must be a list",
                 details={"field": "interests", "type": type(self.interests).__name__},
@@ -188,17 +235,22 @@ class StoryRequest:
                 request_id="validate_interests"
             )
         
-        # Validate each interest
-        for interest in self.interests:
+        # Sanitize, validate and deduplicate each interest in one ordered pass
+        seen = set()
+        unique_interests = []
+        for interest in self.sanitize_many(self.interests):
+            if interest in seen:
+                continue
             if not INTEREST_PATTERN.match(interest):
                 raise AIServiceError(
                     message="Interest must contain only letters, spaces, and hyphens",
                     details={"field": "interests", "invalid_value": interest},
                     request_id="validate_interests"
                 )
+            seen.add(interest)
+            unique_interests.append(interest)
         
-        # Remove duplicates while preserving order
-        self.interests = list(dict.fromkeys(self.interests))
+        self.interests = unique_interests
         return True
 
     def validate_additional_notes(self) -> bool:
@@ -1,15 +1,22 @@
 # External imports with version specifications
 from stability_sdk import client  # version: 0.8.0
-from PIL import Image, ImageEnhance  # version: 9.5.0
+import stability_sdk.interfaces.gooseai.generation.generation_pb2 as generation  # version: 0.8.0
+import stability_sdk.interfaces.gooseai.generation.generation_pb2_grpc as generation_grpc  # version: 0.8.0
+import grpc  # version: 1.53.0
+from PIL import Image, ImageFilter  # version: 9.5.0
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import io
+import queue
 import time
 
 # Internal imports
 from ..models.illustration_request import IllustrationRequest
-from ..utils.error_handler import handle_stable_diffusion_error, AIServiceError
+from ..utils.error_handler import format_stable_diffusion_error, AIServiceError, ContentFilteredError
+from ..utils.executor import run_upstream
+from ..utils.context import generate_local_id
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -23,10 +30,100 @@ STYLE_PROMPTS = {
     "realistic": "photorealistic style, detailed, natural lighting, proper proportions, subtle textures"
 }
 
+# Quality keywords appended to every prompt
+_QUALITY_SUFFIX: str = (
+    ", high quality, detailed, professional"
+    ", masterpiece, highly detailed, best quality, professional"
+)
+
+# Stability gRPC endpoint and channel options. The keepalive interval matches
+# the five-minute minimum ping interval gRPC servers enforce by default, so
+# the server never answers our pings with GOAWAY "too_many_pings".
+STABILITY_HOST: str = 'grpc.stability.ai:443'
+GRPC_CHANNEL_OPTIONS: List[Tuple[str, int]] = [
+    ('grpc.max_send_message_length', 10 * 1024 * 1024),
+    ('grpc.max_receive_message_length', 10 * 1024 * 1024),
+    ('grpc.keepalive_time_ms', 300000),
+    ('grpc.keepalive_timeout_ms', 20000)
+]
+
+# Clients shared by every service instance, keyed by (api key, engine)
+_clients: Dict[Tuple[str, str], client.StabilityInference] = {}
+
+# Maximum number of idle encode buffers kept for reuse
+BUFFER_POOL_SIZE: int = 32
+
 # Constants for retry mechanism
 MAX_RETRIES: int = 3
 RETRY_DELAY: float = 1.0
 
+# Post-processing enhancement factors
+COLOR_FACTOR: float = 1.2
+CONTRAST_FACTOR: float = 1.1
+SHARPNESS_FACTOR: float = 1.15
+
+# Supported output encodings: media type and Pillow save options. PNG uses a
+# fast zlib level; the default optimize=True max-effort search dominated latency.
+OUTPUT_FORMATS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    'PNG': ('image/png', {'compress_level': 1}),
+    'JPEG': ('image/jpeg', {'quality': 92}),
+    'WEBP': ('image/webp', {'quality': 90, 'method': 4})
+}
+
+# ITU-R 601-2 luma weights, as used by PIL's 'L' conversion
+_LUMA: Tuple[float, float, float] = (0.299, 0.587, 0.114)
+
+def _sharpen_kernel(factor: float = SHARPNESS_FACTOR) -> ImageFilter.Kernel:
+    """
+    Builds a 3x3 kernel equivalent to ImageEnhance.Sharpness(factor).
+    
+    Sharpness blends the image with its SMOOTH-filtered copy; folding that
+    blend into the kernel weights gives the same result in one convolution.
+    
+    Args:
+        factor (float): Sharpness enhancement factor
+        
+    Returns:
+        ImageFilter.Kernel: Sharpening kernel
+    """
+    size, scale, _, weights = ImageFilter.SMOOTH.filterargs
+    sharpen = [(1 - factor) * weight / scale for weight in weights]
+    sharpen[len(sharpen) // 2] += factor
+    return ImageFilter.Kernel(size, sharpen, scale=1)
+
+_SHARPEN_KERNEL: ImageFilter.Kernel = _sharpen_kernel()
+
+def _color_contrast_matrix(mean: int, color: float = COLOR_FACTOR,
+                           contrast: float = CONTRAST_FACTOR) -> Tuple[float, ...]:
+    """
+    Builds an RGB conversion matrix applying ImageEnhance.Color then Contrast.
+    
+    Color blends each pixel with its luma L, leaving L unchanged, so contrast
+    can be applied around the input's mean luma:
+    out = contrast * color * px + contrast * (1 - color) * L + (1 - contrast) * mean
+    
+    Args:
+        mean (int): Mean luma of the input image
+        color (float): Color enhancement factor
+        contrast (float): Contrast enhancement factor
+        
+    Returns:
+        Tuple[float, ...]: 12-tuple matrix for Image.convert('RGB', matrix)
+    """
+    offset = (1 - contrast) * mean
+    matrix: List[float] = []
+    for channel in range(3):
+        row = [contrast * (1 - color) * weight for weight in _LUMA]
+        row[channel] += contrast * color
+        matrix.extend(row)
+        matrix.append(offset)
+    return tuple(matrix)
+
+# Mean luma is an integer 0-255, so every possible matrix is built up front
+_COLOR_CONTRAST_MATRICES: Tuple[Tuple[float, ...], ...] = tuple(
+    _color_contrast_matrix(mean) for mean in range(256)
+)
+
 def enhance_image(image: Image.Image, enhance_faces: bool = True) -> Image.Image:
     """
     Applies sophisticated post-processing enhancements to generated images.
@@ -39,21 +136,17 @@ def enhance_image(image: Image.Image, enhance_faces: bool = True) -> Image.Image
         Image.Image: Enhanced image
     """
     try:
-        # Convert to RGB if necessary
+        # Convert to RGB only for non-RGB artifacts; the color matrix needs RGB input
         if image.mode != 'RGB':
             image = image.convert('RGB')
             
-        # Apply adaptive color correction
-        color_enhancer = ImageEnhance.Color(image)
-        image = color_enhancer.enhance(1.2)
-        
-        # Enhance contrast adaptively
-        contrast_enhancer = ImageEnhance.Contrast(image)
-        image = contrast_enhancer.enhance(1.1)
+        # Apply color and contrast correction in a single matrix pass
+        histogram = image.convert('L').histogram()
+        mean = sum(level * count for level, count in enumerate(histogram)) / (image.width * image.height)
+        image = image.convert('RGB', _COLOR_CONTRAST_MATRICES[int(mean + 0.5)])
         
-        # Apply sharpness enhancement
-        sharpness_enhancer = ImageEnhance.Sharpness(image)
-        image = sharpness_enhancer.enhance(1.15)
+        # Apply sharpness enhancement as a single convolution
+        image = image.filter(_SHARPEN_KERNEL)
         
         if enhance_faces:
             # Note: In a production environment, you would implement face detection
@@ -66,13 +159,16 @@ def enhance_image(image: Image.Image, enhance_faces: bool = True) -> Image.Image
         raise AIServiceError(
             message="Image enhancement failed",
             details={"error": str(e)},
-            request_id=str(time.time())
+            request_id=generate_local_id()
         )
 
+@lru_cache(maxsize=2048)
 def format_prompt(prompt: str, style: str) -> str:
     """
     Formats the user prompt with style-specific enhancements.
     
+    Results are cached; retries and repeated prompts reuse the formatted string.
+    
     Args:
         prompt (str): User input prompt
         style (str): Selected illustration style
@@ -81,24 +177,78 @@ def format_prompt(prompt: str, style: str) -> str:
         str: Optimized prompt
     """
     try:
-        # Get style-specific prompt additions
-        style_prompt = STYLE_PROMPTS.get(style.lower(), "")
-        
-        # Combine prompts with optimization
-        formatted_prompt = f"{prompt}, {style_prompt}, high quality, detailed, professional"
-        
-        # Add quality enhancement keywords
-        quality_keywords = "masterpiece, highly detailed, best quality, professional"
-        formatted_prompt = f"{formatted_prompt}, {quality_keywords}"
+        # Get style-specific prompt additions; validated styles are already lowercase
+        style_prompt = STYLE_PROMPTS.get(style)
+        if style_prompt is None:
+            style_prompt = STYLE_PROMPTS.get(style.lower(), "")
         
-        return formatted_prompt
+        return f"{prompt}, {style_prompt}{_QUALITY_SUFFIX}"
     except Exception as e:
         logger.error(f"Prompt formatting failed: {str(e)}")
         raise AIServiceError(
             message="Failed to format prompt",
             details={"error": str(e)},
-            request_id=str(time.time())
+            request_id=generate_local_id()
+        )
+
+class _StabilityClient(client.StabilityInference):
+    """
+    StabilityInference bound to a channel opened with GRPC_CHANNEL_OPTIONS.
+    
+    The SDK constructor always opens its own channel and does not accept
+    channel options, so it is not called; the attributes it would set are
+    set here instead (stability-sdk 0.8.0).
+    """
+    
+    def __init__(self, api_key: str, engine: str, verbose: bool = False):
+        self.verbose = verbose
+        self.engine = engine
+        self.upscale_engine = "esrgan-v1-x2plus"
+        self.grpc_args = {"wait_for_ready": True}
+        
+        credentials = grpc.composite_channel_credentials(
+            grpc.ssl_channel_credentials(),
+            grpc.access_token_call_credentials(api_key)
         )
+        self.channel = grpc.secure_channel(STABILITY_HOST, credentials, options=GRPC_CHANNEL_OPTIONS)
+        self.stub = generation_grpc.GenerationServiceStub(self.channel)
+
+def _on_channel_ready(future: grpc.Future) -> None:
+    """Logs the outcome of the background channel connection."""
+    if future.cancelled():
+        logger.debug("Stability channel connection cancelled")
+    elif future.exception() is not None:
+        logger.warning(f"Stability channel failed to connect: {future.exception()}")
+    else:
+        logger.debug("Stability channel ready")
+
+def _get_client(api_key: str, engine: str, verbose: bool = False) -> client.StabilityInference:
+    """
+    Returns the shared Stability client for an API key and engine.
+    
+    The connection is started in the background so the first generation
+    does not pay for the handshake.
+    
+    Args:
+        api_key (str): Stability API key
+        engine (str): Engine identifier
+        verbose (bool): SDK debug logging flag
+        
+    Returns:
+        client.StabilityInference: Shared client
+    """
+    cache_key = (api_key, engine)
+    inference = _clients.get(cache_key)
+    if inference is not None:
+        return inference
+    
+    inference = _StabilityClient(api_key, engine, verbose)
+    
+    # Connect eagerly without blocking; a warmup generation would bill credits
+    grpc.channel_ready_future(inference.channel).add_done_callback(_on_channel_ready)
+    
+    _clients[cache_key] = inference
+    return inference
 
 class StableDiffusionService:
     """
@@ -114,10 +264,14 @@ class StableDiffusionService:
         """
         try:
             self._config = config
-            self._client = client.StabilityInference(
-                key=config['api_key'],
-                engine=config.get('engine_id', 'stable-diffusion-xl-1024-v1-0'),
-                verbose=config.get('verbose', False)
+            self._output_format = config.get('output_format', 'PNG').upper()
+            self.media_type, self._save_options = OUTPUT_FORMATS[self._output_format]
+            self._enhancement_enabled = config.get('enhance', True)
+            self._buf_pool: queue.LifoQueue = queue.LifoQueue(maxsize=BUFFER_POOL_SIZE)
+            self._client = _get_client(
+                config['api_key'],
+                config.get('engine_id', 'stable-diffusion-xl-1024-v1-0'),
+                config.get('verbose', False)
             )
             logger.info("Stable Diffusion service initialized successfully")
         except Exception as e:
@@ -125,7 +279,7 @@ class StableDiffusionService:
             raise AIServiceError(
                 message="Service initialization failed",
                 details={"error": str(e)},
-                request_id=str(time.time())
+                request_id=generate_local_id()
             )
 
     async def generate_illustration(self, request: IllustrationRequest) -> bytes:
@@ -153,53 +307,168 @@ class StableDiffusionService:
             # Generate image with retry mechanism
             for attempt in range(MAX_RETRIES):
                 try:
-                    # Call Stable Diffusion API
-                    answers = self._client.generate(
-                        prompt=formatted_prompt,
-                        width=request.size[0],
-                        height=request.size[1],
-                        samples=1,
-                        cfg_scale=7.0,
-                        steps=30,
-                        seed=int(time.time() * 1000)
+                    # Call the blocking Stable Diffusion client in the upstream pool
+                    artifact = await run_upstream(
+                        self._fetch_artifact,
+                        formatted_prompt,
+                        request.size[0],
+                        request.size[1]
                     )
                     
                     # Process the generated image
-                    for answer in answers:
-                        if answer.artifacts:
-                            # Get the first artifact
-                            artifact = answer.artifacts[0]
-                            
-                            # Convert to PIL Image for enhancement
-                            image = Image.open(io.BytesIO(artifact.binary))
-                            
-                            # Apply enhancements
-                            enhanced_image = enhance_image(image, request.enhance_faces)
-                            
-                            # Convert back to bytes
-                            img_byte_arr = io.BytesIO()
-                            enhanced_image.save(img_byte_arr, format='PNG', optimize=True)
-                            
-                            # Log performance metrics
-                            generation_time = time.time() - start_time
-                            logger.info(f"Image generated successfully in {generation_time:.2f}s")
-                            
-                            return img_byte_arr.getvalue()
+                    if artifact is not None:
+                        # Stability returns PNG; pass it through when there is nothing to apply
+                        if not self._enhancement_enabled and self._output_format == 'PNG':
+                            image_bytes = artifact
+                        else:
+                            # Decode, enhance and re-encode off the event loop
+                            image_bytes = await asyncio.to_thread(
+                                self._postprocess, artifact, request.enhance_faces
+                            )
+                        
+                        # Log performance metrics
+                        generation_time = time.time() - start_time
+                        logger.info(f"Image generated successfully in {generation_time:.2f}s")
+                        
+                        return image_bytes
                             
                     raise AIServiceError(
                         message="No artifacts generated",
                         details={"attempt": attempt + 1},
-                        request_id=str(time.time())
+                        request_id=generate_local_id()
                     )
                     
-                except Exception as e:
+                except AIServiceError:
+                    # Filtered or empty generations are billed; retrying would not help
+                    raise
+                except Exception:
                     if attempt == MAX_RETRIES - 1:
                         raise
                     await asyncio.sleep(RETRY_DELAY * (2 ** attempt))
                     
         except Exception as e:
             logger.error(f"Image generation failed: {str(e)}")
-            raise handle_stable_diffusion_error(e, context)
+            raise format_stable_diffusion_error(e, context)
+
+    def _postprocess(self, binary: bytes, enhance_faces: bool) -> bytes:
+        """
+        Decodes, enhances and re-encodes a generated image.
+        
+        Enhancement is skipped when disabled in config; the image is then
+        only converted to the configured output format.
+        
+        CPU-bound; run in a worker thread so it does not block the event loop.
+        
+        Args:
+            binary (bytes): Image bytes returned by Stability
+            enhance_faces (bool): Flag for face enhancement
+            
+        Returns:
+            bytes: Enhanced image in the configured output format
+        """
+        # Convert to PIL Image for enhancement; draft lets decoders that
+        # support it (JPEG) decode straight to RGB instead of converting later
+        image = Image.open(io.BytesIO(binary))
+        image.draft('RGB', image.size)
+        
+        # Apply enhancements
+        if self._enhancement_enabled:
+            image = enhance_image(image, enhance_faces)
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        
+        # Convert back to bytes
+        return self._encode(image)
+
+    def _get_buf(self) -> io.BytesIO:
+        """Takes an encode buffer from the pool, or creates one."""
+        try:
+            return self._buf_pool.get_nowait()
+        except queue.Empty:
+            return io.BytesIO()
+
+    def _put_buf(self, buf: io.BytesIO) -> None:
+        """
+        Returns an encode buffer to the pool.
+        
+        The buffer is rewound rather than truncated so its allocation is kept;
+        readers slice it by the written length.
+        """
+        buf.seek(0)
+        try:
+            self._buf_pool.put_nowait(buf)
+        except queue.Full:
+            pass
+
+    def _encode(self, image: Image.Image) -> bytes:
+        """
+        Encodes an image in the configured output format using a pooled buffer.
+        
+        Args:
+            image (Image.Image): Image to encode
+            
+        Returns:
+            bytes: Encoded image
+        """
+        buf = self._get_buf()
+        try:
+            image.save(buf, format=self._output_format, **self._save_options)
+            size = buf.tell()
+            with buf.getbuffer() as view:
+                return view[:size].tobytes()
+        finally:
+            self._put_buf(buf)
+
+    def _fetch_artifact(self, prompt: str, width: int, height: int) -> Optional[bytes]:
+        """
+        Calls the blocking Stability API and returns the first image artifact.
+        
+        Runs in the upstream thread pool; the response stream is consumed
+        here so the event loop never blocks on it, and is closed as soon as
+        an unfiltered image arrives.
+        
+        Args:
+            prompt (str): Formatted prompt
+            width (int): Image width
+            height (int): Image height
+            
+        Returns:
+            Optional[bytes]: Raw image bytes, or None if no image was returned
+            
+        Raises:
+            ContentFilteredError: If the only images returned were filtered
+        """
+        answers = self._client.generate(
+            prompt=prompt,
+            width=width,
+            height=height,
+            samples=1,
+            cfg_scale=7.0,
+            steps=30,
+            seed=int(time.time() * 1000)
+        )
+        
+        filtered = False
+        try:
+            for answer in answers:
+                for artifact in answer.artifacts:
+                    if artifact.type != generation.ARTIFACT_IMAGE:
+                        continue
+                    if artifact.finish_reason == generation.FILTER:
+                        filtered = True
+                        continue
+                    return artifact.binary
+        finally:
+            # Stop the response stream once the image has arrived
+            answers.close()
+        
+        if filtered:
+            raise ContentFilteredError(
+                message="Generated image was rejected by the safety filter",
+                details={"finish_reason": "FILTER"},
+                request_id=generate_local_id()
+            )
+        return None
 
     def _handle_generation_error(self, error: Exception) -> None:
         """
@@ -223,5 +492,5 @@ class StableDiffusionService:
         raise AIServiceError(
             message="Image generation failed",
             details={"original_error": str(error), **error_context},
-            request_id=str(error_time)
+            request_id=generate_local_id()
         )
\ No newline at end of file
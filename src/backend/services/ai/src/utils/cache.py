@@ -0,0 +1,79 @@
+"""
+Response Cache Module
+
+Short-lived in-process cache for cheap, frequently polled endpoints such as
+health probes. Refreshes are single-flighted per key and the last good payload
+is served for a grace period when the upstream check fails.
+
+Version: 1.0.0
+"""
+
+import asyncio  # built-in
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+import orjson  # version: 3.9.10
+
+# Cache settings
+HEALTH_CACHE_TTL: float = 2.0  # seconds
+STALE_FALLBACK_TTL: float = 60.0  # seconds
+
+# key -> (monotonic timestamp, serialized payload, ETag)
+_health_cache: Dict[str, Tuple[float, bytes, str]] = {}
+_locks: Dict[str, asyncio.Lock] = {}
+
+async def cached(
+    key: str,
+    ttl: float,
+    fn: Callable[[], Awaitable[Dict[str, Any]]],
+    stale_ttl: float = STALE_FALLBACK_TTL
+) -> Tuple[bytes, str]:
+    """
+    Return the serialized result of ``fn`` cached for ``ttl`` seconds.
+
+    Concurrent callers for the same key share a single refresh. If the refresh
+    fails, a payload younger than ``stale_ttl`` is returned instead.
+
+    Args:
+        key (str): Cache key, typically the endpoint name
+        ttl (float): Freshness window in seconds
+        fn (Callable): Coroutine function producing the payload dictionary
+        stale_ttl (float): Maximum age of a payload served after a failure
+
+    Returns:
+        Tuple[bytes, str]: JSON payload bytes and their ETag
+
+    Raises:
+        Exception: Whatever ``fn`` raised when no usable cached payload exists
+    """
+    entry = _health_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < ttl:
+        return entry[1], entry[2]
+
+    lock = _locks.get(key)
+    if lock is None:
+        lock = _locks[key] = asyncio.Lock()
+    async with lock:
+        # Another caller may have refreshed while we waited
+        entry = _health_cache.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1], entry[2]
+
+        try:
+            payload = orjson.dumps(await fn())
+        except Exception:
+            if entry is not None and now - entry[0] < stale_ttl:
+                return entry[1], entry[2]
+            raise
+
+        etag = f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+        _health_cache[key] = (time.monotonic(), payload, etag)
+        return payload, etag
+
+__all__ = [
+    'cached',
+    'HEALTH_CACHE_TTL',
+    'STALE_FALLBACK_TTL'
+]
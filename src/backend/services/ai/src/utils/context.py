@@ -0,0 +1,84 @@
+"""
+Request Context Module
+
+Holds per-request context shared between middleware, controllers and logging,
+propagated through asyncio tasks via context variables.
+
+Version: 1.0.0
+"""
+
+from contextvars import ContextVar  # built-in
+import itertools
+import os
+from typing import Any, Dict
+from uuid import uuid4
+
+# Request ID for the request currently being handled
+request_id_var: ContextVar[str] = ContextVar("request_id")
+
+def new_request_id() -> str:
+    """
+    Generate a compact request identifier.
+
+    Returns:
+        str: 32-character hex request ID
+    """
+    return uuid4().hex
+
+# Process-local ID sequence for internal errors, cheaper than a UUID per error
+_worker_id = os.getpid()
+_local_ids = itertools.count(1)
+
+def generate_local_id() -> str:
+    """
+    Generate an identifier unique within this worker process.
+    
+    Used for internal errors that only need in-process traceability; request
+    boundaries keep UUID-based IDs.
+    
+    Returns:
+        str: "<pid>-<sequence>" identifier
+    """
+    return f"{_worker_id}-{next(_local_ids)}"
+
+def get_request_id() -> str:
+    """
+    Get the request ID bound to the current context.
+
+    Falls back to a fresh ID (and binds it) when called outside of a request,
+    e.g. from background tasks or tests.
+
+    Returns:
+        str: Current request ID
+    """
+    try:
+        return request_id_var.get()
+    except LookupError:
+        request_id = new_request_id()
+        request_id_var.set(request_id)
+        return request_id
+
+def inject_request_id(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Structlog processor adding the current request ID to every log record.
+
+    Args:
+        logger: Wrapped logger
+        method_name (str): Name of the log method called
+        event_dict (dict): Log event dictionary
+
+    Returns:
+        dict: Event dictionary with request_id set
+    """
+    request_id = request_id_var.get(None)
+    if request_id is not None:
+        event_dict.setdefault("request_id", request_id)
+    return event_dict
+
+__all__ = [
+    'request_id_var',
+    'new_request_id',
+    'generate_local_id',
+    'get_request_id',
+    'inject_request_id'
+]
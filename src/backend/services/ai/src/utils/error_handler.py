@@ -1,20 +1,15 @@
 # External imports with version specifications
 from fastapi import HTTPException  # version: 0.95.0
-import openai  # version: 1.3.0
 from stability_sdk import exceptions as stability_exceptions  # version: 0.8.0
 import logging
 import time
 import uuid
-from functools import wraps
-from typing import Dict, Any, Optional
+from functools import cached_property, lru_cache, wraps
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Global constants
-MAX_RETRIES = 3
-RETRY_DELAY = 1.5
-
 # Standardized error messages
 ERROR_MESSAGES = {
     'RATE_LIMIT': 'API rate limit exceeded. Please try again later.',
@@ -27,38 +22,38 @@ ERROR_MESSAGES = {
     'RESOURCE_EXHAUSTED': 'AI resource quota exhausted.'
 }
 
-def retry(max_attempts: int = MAX_RETRIES, delay: float = RETRY_DELAY):
+# Default mapping for unrecognized upstream errors
+_DEFAULT_ERROR_STATUS = (500, ERROR_MESSAGES['API_ERROR'])
+
+@lru_cache(maxsize=1)
+def _get_openai_error_map() -> Dict[type, tuple]:
     """
-    Retry decorator with exponential backoff for handling transient errors.
+    Build the OpenAI exception type -> (status code, message) mapping once.
     
-    Args:
-        max_attempts (int): Maximum number of retry attempts
-        delay (float): Base delay between retries in seconds
-    """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            last_exception = None
-            for attempt in range(max_attempts):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    if not _is_retryable_error(e):
-                        raise
-                    wait_time = delay * (2 ** attempt)
-                    logger.warning(f"Retry attempt {attempt + 1}/{max_attempts} after {wait_time}s delay")
-                    time.sleep(wait_time)
-            raise AIServiceError(
-                message=ERROR_MESSAGES['RETRY_FAILED'],
-                details={'original_error': str(last_exception)},
-                request_id=str(uuid.uuid4())
-            )
-        return wrapper
-    return decorator
+    Built on first use so the OpenAI SDK stays out of import-time cost.
+    
+    Returns:
+        dict: Mapping of OpenAI exception types to status codes and messages
+    """
+    import openai  # version: 1.3.0
+    
+    return {
+        openai.RateLimitError: (429, ERROR_MESSAGES['RATE_LIMIT']),
+        openai.BadRequestError: (400, ERROR_MESSAGES['INVALID_REQUEST']),
+        openai.APITimeoutError: (504, ERROR_MESSAGES['TIMEOUT']),
+        openai.APIError: (500, ERROR_MESSAGES['API_ERROR'])
+    }
 
 class AIServiceError(Exception):
-    """Enhanced custom exception class for AI service errors with telemetry."""
+    """
+    Enhanced custom exception class for AI service errors with telemetry.
+    
+    Construction does not log; errors are logged by the handler that turns
+    them into a response, so errors recovered by a retry cost no log work.
+    """
+    
+    # performance_metrics is a cached_property stored in the instance __dict__
+    __slots__ = ('message', 'details', 'request_id', 'timestamp')
     
     def __init__(self, message: str, details: Dict[str, Any], request_id: str):
         """
@@ -74,16 +69,15 @@ class AIServiceError(Exception):
         self.details = details
         self.request_id = request_id
         self.timestamp = time.time()
-        self.performance_metrics = {
+
+    @cached_property
+    def performance_metrics(self) -> Dict[str, Any]:
+        """Telemetry for the error, built on first access."""
+        return {
             'timestamp': self.timestamp,
-            'latency': details.get('latency', 0),
-            'retry_count': details.get('retry_count', 0)
+            'latency': self.details.get('latency', 0),
+            'retry_count': self.details.get('retry_count', 0)
         }
-        logger.error(f"AIServiceError: {message}", extra={
-            'request_id': request_id,
-            'details': details,
-            'metrics': self.performance_metrics
-        })
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert error to detailed dictionary format with telemetry."""
@@ -98,29 +92,27 @@ class AIServiceError(Exception):
             }
         }
 
-def _is_retryable_error(error: Exception) -> bool:
+class ContentFilteredError(AIServiceError):
     """
-    Determine if an error is retryable based on its type and context.
+    Raised when Stability's safety filter rejects a generated image.
     
-    Args:
-        error (Exception): The error to evaluate
+    Not retryable: regenerating the same prompt is billed and is filtered again.
+    """
     
-    Returns:
-        bool: True if error is retryable, False otherwise
-    """
-    retryable_errors = (
-        openai.error.RateLimitError,
-        openai.error.ServiceUnavailableError,
-        openai.error.APIConnectionError,
-        stability_exceptions.RateLimitError,
-        stability_exceptions.ServerError
-    )
-    return isinstance(error, retryable_errors)
+    __slots__ = ()
+
+# Stable Diffusion exception type -> (status code, message)
+_SD_ERROR_MAP = {
+    stability_exceptions.RateLimitError: (429, ERROR_MESSAGES['RATE_LIMIT']),
+    stability_exceptions.InvalidRequestError: (400, ERROR_MESSAGES['INVALID_REQUEST']),
+    stability_exceptions.ServerError: (500, ERROR_MESSAGES['API_ERROR']),
+    stability_exceptions.ResourceExhaustedError: (429, ERROR_MESSAGES['RESOURCE_EXHAUSTED']),
+    ContentFilteredError: (400, ERROR_MESSAGES['CONTENT_FILTER'])
+}
 
-@retry()
-def handle_openai_error(error: Exception, context: Dict[str, Any]) -> HTTPException:
+def format_openai_error(error: Exception, context: Dict[str, Any]) -> HTTPException:
     """
-    Handle OpenAI API specific errors with retry mechanism and performance monitoring.
+    Format an OpenAI API error as an HTTP exception with performance details.
     
     Args:
         error (Exception): The OpenAI API error
@@ -133,18 +125,7 @@ def handle_openai_error(error: Exception, context: Dict[str, Any]) -> HTTPExcept
     start_time = context.get('start_time', time.time())
     latency = time.time() - start_time
 
-    error_mapping = {
-        openai.error.RateLimitError: (429, ERROR_MESSAGES['RATE_LIMIT']),
-        openai.error.InvalidRequestError: (400, ERROR_MESSAGES['INVALID_REQUEST']),
-        openai.error.APIError: (500, ERROR_MESSAGES['API_ERROR']),
-        openai.error.Timeout: (504, ERROR_MESSAGES['TIMEOUT']),
-        openai.error.ContentFilterError: (422, ERROR_MESSAGES['CONTENT_FILTER'])
-    }
-
-    status_code, message = error_mapping.get(
-        type(error),
-        (500, ERROR_MESSAGES['API_ERROR'])
-    )
+    status_code, message = _get_openai_error_map().get(type(error), _DEFAULT_ERROR_STATUS)
 
     error_details = format_error_response(
         message=message,
@@ -160,7 +141,8 @@ def handle_openai_error(error: Exception, context: Dict[str, Any]) -> HTTPExcept
     logger.error(f"OpenAI API Error: {message}", extra={
         'request_id': request_id,
         'error_details': error_details,
-        'status_code': status_code
+        'status_code': status_code,
+        'service_error': error.to_dict() if isinstance(error, AIServiceError) else None
     })
 
     return HTTPException(
@@ -168,10 +150,9 @@ def handle_openai_error(error: Exception, context: Dict[str, Any]) -> HTTPExcept
         detail=error_details
     )
 
-@retry()
-def handle_stable_diffusion_error(error: Exception, context: Dict[str, Any]) -> HTTPException:
+def format_stable_diffusion_error(error: Exception, context: Dict[str, Any]) -> HTTPException:
     """
-    Handle Stable Diffusion API errors with performance tracking and retry logic.
+    Format a Stable Diffusion API error as an HTTP exception with performance details.
     
     Args:
         error (Exception): The Stable Diffusion API error
@@ -184,17 +165,7 @@ def handle_stable_diffusion_error(error: Exception, context: Dict[str, Any]) ->
     start_time = context.get('start_time', time.time())
     latency = time.time() - start_time
 
-    error_mapping = {
-        stability_exceptions.RateLimitError: (429, ERROR_MESSAGES['RATE_LIMIT']),
-        stability_exceptions.InvalidRequestError: (400, ERROR_MESSAGES['INVALID_REQUEST']),
-        stability_exceptions.ServerError: (500, ERROR_MESSAGES['API_ERROR']),
-        stability_exceptions.ResourceExhaustedError: (429, ERROR_MESSAGES['RESOURCE_EXHAUSTED'])
-    }
-
-    status_code, message = error_mapping.get(
-        type(error),
-        (500, ERROR_MESSAGES['API_ERROR'])
-    )
+    status_code, message = _SD_ERROR_MAP.get(type(error), _DEFAULT_ERROR_STATUS)
 
     error_details = format_error_response(
         message=message,
@@ -210,7 +181,8 @@ def handle_stable_diffusion_error(error: Exception, context: Dict[str, Any]) ->
     logger.error(f"Stable Diffusion API Error: {message}", extra={
         'request_id': request_id,
         'error_details': error_details,
-        'status_code': status_code
+        'status_code': status_code,
+        'service_error': error.to_dict() if isinstance(error, AIServiceError) else None
     })
 
     return HTTPException(
@@ -218,6 +190,52 @@ def handle_stable_diffusion_error(error: Exception, context: Dict[str, Any]) ->
         detail=error_details
     )
 
+def handle_openai_error(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Decorator converting OpenAI errors raised by an async handler into HTTP errors.
+    
+    The success path only pays for the ``try`` block; HTTP exceptions raised
+    by the handler pass through unchanged.
+    
+    Args:
+        func (Callable): Async handler to wrap
+    
+    Returns:
+        Callable: Wrapped handler
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise format_openai_error(e, {}) from e
+    return wrapper
+
+def handle_stable_diffusion_error(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Decorator converting Stable Diffusion errors raised by an async handler into HTTP errors.
+    
+    The success path only pays for the ``try`` block; HTTP exceptions raised
+    by the handler pass through unchanged.
+    
+    Args:
+        func (Callable): Async handler to wrap
+    
+    Returns:
+        Callable: Wrapped handler
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise format_stable_diffusion_error(e, {}) from e
+    return wrapper
+
 def format_error_response(message: str, details: Dict[str, Any], request_id: str) -> Dict[str, Any]:
     """
     Format error details into a comprehensive response structure with telemetry.
@@ -0,0 +1,65 @@
+"""
+Upstream Executor Module
+
+Dedicated thread pool for blocking upstream SDK calls (OpenAI, Stability),
+kept separate from the event loop's default executor so slow upstream calls
+cannot starve other threadpool users.
+
+Version: 1.0.0
+"""
+
+import asyncio  # built-in
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Sized for the expected number of in-flight upstream calls
+UPSTREAM_POOL_SIZE: int = 64
+
+_upstream_pool: Optional[ThreadPoolExecutor] = None
+
+def get_upstream_pool() -> ThreadPoolExecutor:
+    """
+    Get the shared upstream thread pool, creating it on first use.
+
+    Returns:
+        ThreadPoolExecutor: Pool dedicated to blocking upstream calls
+    """
+    global _upstream_pool
+    if _upstream_pool is None:
+        _upstream_pool = ThreadPoolExecutor(
+            max_workers=UPSTREAM_POOL_SIZE,
+            thread_name_prefix="ai-upstream"
+        )
+    return _upstream_pool
+
+async def run_upstream(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking upstream call in the dedicated thread pool.
+
+    Args:
+        fn (Callable): Blocking callable
+        *args: Positional arguments for ``fn``
+        **kwargs: Keyword arguments for ``fn``
+
+    Returns:
+        Result of ``fn``
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_upstream_pool(), partial(fn, *args, **kwargs))
+
+def shutdown_upstream_pool() -> None:
+    """Shut down the upstream pool without waiting for in-flight calls."""
+    global _upstream_pool
+    if _upstream_pool is not None:
+        _upstream_pool.shutdown(wait=False, cancel_futures=True)
+        _upstream_pool = None
+
+__all__ = [
+    'UPSTREAM_POOL_SIZE',
+    'get_upstream_pool',
+    'run_upstream',
+    'shutdown_upstream_pool'
+]
@@ -8,13 +8,15 @@ Version: 1.0.0
 """
 
 import re
-from typing import Dict, Any, List, Tuple, Optional, Pattern
-from functools import wraps
-import time
+from bisect import bisect_right
+from typing import Dict, Any, List, Tuple, Optional, Pattern, Sequence, Set
 from dataclasses import dataclass
 import unicodedata
 
+import ahocorasick  # version: 2.0.0
+
 from .error_handler import AIServiceError
+from .context import generate_local_id
 from ..config import OPENAI_CONFIG, STABLE_DIFFUSION_CONFIG
 
 # Content Safety Constants
@@ -34,57 +36,90 @@ AGE_INAPPROPRIATE_CONTENT: List[str] = [
     # Age-specific inappropriate content patterns
 ]
 
+def _compile_union(patterns: List[str]) -> Tuple[Optional[Pattern], Dict[str, str]]:
+    """
+    Compile patterns into one case-insensitive alternation.
+    
+    Each pattern gets a named group so a match can be traced back to it.
+    Leading (?i) flags are dropped since the union is case-insensitive.
+    
+    Returns:
+        Tuple of the compiled union (None if there are no patterns) and a
+        mapping of group name to original pattern
+    """
+    if not patterns:
+        return None, {}
+    
+    sources = {f'p{index}': pattern for index, pattern in enumerate(patterns)}
+    union = '|'.join(
+        f'(?P<{name}>{pattern[4:] if pattern.startswith("(?i)") else pattern})'
+        for name, pattern in sources.items()
+    )
+    return re.compile(union, re.IGNORECASE), sources
+
+def _build_keyword_automaton(keywords: List[str]) -> Optional[ahocorasick.Automaton]:
+    """Build an Aho-Corasick automaton matching all keywords in one pass."""
+    if not keywords:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword.lower(), keyword)
+    automaton.make_automaton()
+    return automaton
+
+# Content safety matchers, each scanned in a single pass
+_NSFW_AC = _build_keyword_automaton(NSFW_KEYWORDS)
+_UNSAFE_RE, _UNSAFE_GROUPS = _compile_union(UNSAFE_PATTERNS)
+_AGE_RE, _AGE_GROUPS = _compile_union(AGE_INAPPROPRIATE_CONTENT)
+
+# Separator placed between prompts when they are scanned as one corpus
+_BATCH_SEPARATOR: str = '\x00\x01'
+
 # Validation Constants
 MAX_PROMPT_LENGTH: int = OPENAI_CONFIG['max_tokens']
 MIN_PROMPT_LENGTH: int = 10
 NAME_PATTERN: Pattern = re.compile(r'^[a-zA-Z0-9\s-]{1,50}$')
 AGE_RANGE: Tuple[int, int] = (3, 12)
-VALIDATION_TIMEOUT: int = 5000  # milliseconds
-
-def timeout(ms: int):
-    """Decorator to enforce validation timeout limits."""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
-            result = func(*args, **kwargs)
-            if (time.time() - start_time) * 1000 > ms:
-                raise AIServiceError(
-                    message="Validation timeout exceeded",
-                    details={"timeout": ms},
-                    request_id=str(time.time())
-                )
-            return result
-        return wrapper
-    return decorator
+# Raw input longer than this multiple of max_length is rejected before normalization
+RAW_LENGTH_FACTOR: int = 100
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ValidationResult:
     """Structured validation result with detailed feedback."""
     is_valid: bool
     message: str
     details: Optional[Dict[str, Any]] = None
 
+# Shared success results; successes carry no per-call payload
+_SAFETY_OK = ValidationResult(is_valid=True, message="Content passed safety checks")
+_PROMPT_OK = ValidationResult(is_valid=True, message="Prompt validation successful")
+
 class ContentValidator:
     """Enhanced content validation with comprehensive safety checks."""
     
     def __init__(self):
         """Initialize validation patterns and content filters."""
-        self._unsafe_patterns = [re.compile(pattern) for pattern in UNSAFE_PATTERNS]
-        self._age_patterns = [re.compile(pattern) for pattern in AGE_INAPPROPRIATE_CONTENT]
         self._name_pattern = NAME_PATTERN
     
     def _normalize_text(self, text: str) -> str:
         """Normalize unicode characters and remove control characters."""
         return unicodedata.normalize('NFKC', text)
     
-    def _check_content_safety(self, text: str) -> ValidationResult:
-        """Comprehensive content safety validation."""
-        normalized_text = self._normalize_text(text.lower())
+    def _check_content_safety(self, text: str, already_normalized: bool = False) -> ValidationResult:
+        """
+        Comprehensive content safety validation.
+        
+        NFKC normalization is skipped for ASCII text and for text the caller
+        has already normalized.
+        """
+        normalized_text = text.lower()
+        if not (already_normalized or normalized_text.isascii()):
+            normalized_text = self._normalize_text(normalized_text)
         
         # Check NSFW keywords
-        for keyword in NSFW_KEYWORDS:
-            if keyword in normalized_text:
+        if _NSFW_AC is not None:
+            for _, keyword in _NSFW_AC.iter(normalized_text):
                 return ValidationResult(
                     is_valid=False,
                     message="Content contains inappropriate keywords",
@@ -92,27 +127,102 @@ class ContentValidator:
                 )
         
         # Check unsafe patterns
-        for pattern in self._unsafe_patterns:
-            if pattern.search(normalized_text):
-                return ValidationResult(
+        match = _UNSAFE_RE.search(normalized_text) if _UNSAFE_RE is not None else None
+        if match:
+            return ValidationResult(
+                is_valid=False,
+                message="Content contains unsafe patterns",
+                details={"pattern": _UNSAFE_GROUPS[match.lastgroup]}
+            )
+        
+        # Check age-inappropriate content
+        match = _AGE_RE.search(normalized_text) if _AGE_RE is not None else None
+        if match:
+            return ValidationResult(
+                is_valid=False,
+                message="Content not suitable for target age group",
+                details={"pattern": _AGE_GROUPS[match.lastgroup]}
+            )
+        
+        return _SAFETY_OK
+
+    def validate_many(self, prompts: Sequence[str], already_normalized: bool = False) -> List[ValidationResult]:
+        """
+        Run the content safety check over a batch of prompts.
+        
+        The prompts are joined into one corpus so each matcher scans the batch
+        in a single pass; match offsets are mapped back to prompt indices with
+        bisect. A prompt touched by a match that crosses a prompt boundary is
+        rechecked on its own, so results match _check_content_safety exactly.
+        
+        Args:
+            prompts: Prompts to check
+            already_normalized: Whether the prompts are already NFKC-normalized
+        
+        Returns:
+            List[ValidationResult]: One result per prompt, in input order
+        """
+        texts = []
+        for prompt in prompts:
+            text = prompt.lower()
+            if not (already_normalized or text.isascii()):
+                text = self._normalize_text(text)
+            texts.append(text)
+        
+        starts = []
+        ends = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text)
+            ends.append(offset)
+            offset += len(_BATCH_SEPARATOR)
+        corpus = _BATCH_SEPARATOR.join(texts)
+        
+        failures: Dict[int, ValidationResult] = {}
+        recheck: Set[int] = set()
+        
+        def record(start: int, end: int, result: ValidationResult) -> None:
+            index = bisect_right(starts, start) - 1
+            if end > ends[index]:
+                recheck.update(range(index, bisect_right(starts, end - 1)))
+            else:
+                failures.setdefault(index, result)
+        
+        # Matchers run in the same priority order as _check_content_safety,
+        # so the first failure recorded for a prompt is the one it reports
+        if _NSFW_AC is not None:
+            for end, keyword in _NSFW_AC.iter(corpus):
+                record(end + 1 - len(keyword.lower()), end + 1, ValidationResult(
+                    is_valid=False,
+                    message="Content contains inappropriate keywords",
+                    details={"keyword": keyword}
+                ))
+        
+        if _UNSAFE_RE is not None:
+            for match in _UNSAFE_RE.finditer(corpus):
+                record(match.start(), match.end(), ValidationResult(
                     is_valid=False,
                     message="Content contains unsafe patterns",
-                    details={"pattern": pattern.pattern}
-                )
+                    details={"pattern": _UNSAFE_GROUPS[match.lastgroup]}
+                ))
         
-        # Check age-inappropriate content
-        for pattern in self._age_patterns:
-            if pattern.search(normalized_text):
-                return ValidationResult(
+        if _AGE_RE is not None:
+            for match in _AGE_RE.finditer(corpus):
+                record(match.start(), match.end(), ValidationResult(
                     is_valid=False,
                     message="Content not suitable for target age group",
-                    details={"pattern": pattern.pattern}
-                )
+                    details={"pattern": _AGE_GROUPS[match.lastgroup]}
+                ))
         
-        return ValidationResult(is_valid=True, message="Content passed safety checks")
+        return [
+            self._check_content_safety(text, already_normalized=True) if index in recheck
+            else failures.get(index, _SAFETY_OK)
+            for index, text in enumerate(texts)
+        ]
 
-    def validate_story_prompt(self, prompt: str) -> ValidationResult:
-        """Validate story generation prompt."""
+    def validate_story_prompt(self, prompt: str, already_normalized: bool = False) -> ValidationResult:
+        """Validate story generation prompt, optionally already NFKC-normalized."""
         if not isinstance(prompt, str):
             return ValidationResult(
                 is_valid=False,
@@ -138,13 +248,49 @@ class ContentValidator:
             )
         
         # Content safety validation
-        safety_result = self._check_content_safety(prompt)
+        safety_result = self._check_content_safety(prompt, already_normalized)
         if not safety_result.is_valid:
             return safety_result
         
-        return ValidationResult(is_valid=True, message="Prompt validation successful")
+        return _PROMPT_OK
+
+    def validate_story_fields(self, character_name: str, theme: str,
+                              interests: Sequence[str],
+                              already_normalized: bool = False) -> ValidationResult:
+        """
+        Validate story request fields without joining them into one prompt.
+        
+        Applies the same length limits as validate_story_prompt to the
+        space-joined fields, then checks each field separately and stops at
+        the first violation. Pass already_normalized for fields that have
+        been NFKC-normalized, e.g. by StoryRequest.
+        """
+        prompt_length = (
+            len(character_name) + len(theme)
+            + sum(len(interest) for interest in interests) + len(interests) + 1
+        )
+        
+        if prompt_length < MIN_PROMPT_LENGTH:
+            return ValidationResult(
+                is_valid=False,
+                message="Prompt too short",
+                details={"min_length": MIN_PROMPT_LENGTH}
+            )
+        
+        if prompt_length > MAX_PROMPT_LENGTH:
+            return ValidationResult(
+                is_valid=False,
+                message="Prompt exceeds maximum length",
+                details={"max_length": MAX_PROMPT_LENGTH}
+            )
+        
+        for field in (character_name, theme, *interests):
+            safety_result = self._check_content_safety(field, already_normalized)
+            if not safety_result.is_valid:
+                return safety_result
+        
+        return _PROMPT_OK
 
-@timeout(VALIDATION_TIMEOUT)
 def validate_string(value: str, min_length: int = 1, max_length: int = MAX_PROMPT_LENGTH,
                    allow_special_chars: bool = False) -> str:
     """Validate and sanitize string input."""
@@ -152,7 +298,15 @@ def validate_string(value: str, min_length: int = 1, max_length: int = MAX_PROMP
         raise AIServiceError(
             message="Invalid input type",
             details={"expected": "string", "received": type(value).__name__},
-            request_id=str(time.time())
+            request_id=generate_local_id()
+        )
+    
+    # Reject oversized input before any normalization work
+    if len(value) > max_length * RAW_LENGTH_FACTOR:
+        raise AIServiceError(
+            message="Invalid string length",
+            details={"min": min_length, "max": max_length, "received": len(value)},
+            request_id=generate_local_id()
         )
     
     value = value.strip()
@@ -162,7 +316,7 @@ def validate_string(value: str, min_length: int = 1, max_length: int = MAX_PROMP
         raise AIServiceError(
             message="Invalid string length",
             details={"min": min_length, "max": max_length, "received": len(normalized_value)},
-            request_id=str(time.time())
+            request_id=generate_local_id()
         )
     
     if not allow_special_chars:
@@ -170,19 +324,18 @@ def validate_string(value: str, min_length: int = 1, max_length: int = MAX_PROMP
             raise AIServiceError(
                 message="String contains invalid characters",
                 details={"pattern": NAME_PATTERN.pattern},
-                request_id=str(time.time())
+                request_id=generate_local_id()
             )
     
     return normalized_value
 
-@timeout(VALIDATION_TIMEOUT)
 def validate_age(age: int) -> int:
     """Validate age input for story generation."""
     if not isinstance(age, int):
         raise AIServiceError(
             message="Invalid age type",
             details={"expected": "integer", "received": type(age).__name__},
-            request_id=str(time.time())
+            request_id=generate_local_id()
         )
     
     min_age, max_age = AGE_RANGE
@@ -190,19 +343,18 @@ def validate_age(age: int) -> int:
         raise AIServiceError(
             message="Age out of acceptable range",
             details={"min": min_age, "max": max_age, "received": age},
-            request_id=str(time.time())
+            request_id=generate_local_id()
         )
     
     return age
 
-@timeout(VALIDATION_TIMEOUT)
 def validate_image_dimensions(dimensions: Tuple[int, int]) -> Tuple[int, int]:
     """Validate image dimensions for Stable Diffusion."""
     if not isinstance(dimensions, tuple) or len(dimensions) != 2:
         raise AIServiceError(
             message="Invalid dimensions format",
             details={"expected": "tuple(int, int)", "received": str(dimensions)},
-            request_id=str(time.time())
+            request_id=generate_local_id()
         )
     
     width, height = dimensions
@@ -212,7 +364,7 @@ def validate_image_dimensions(dimensions: Tuple[int, int]) -> Tuple[int, int]:
         raise AIServiceError(
             message="Dimensions must be multiples of base resolution",
             details={"base_width": base_width, "base_height": base_height},
-            request_id=str(time.time())
+            request_id=generate_local_id()
         )
     
     max_dimension = 2048  # Maximum supported dimension
@@ -220,7 +372,7 @@ def validate_image_dimensions(dimensions: Tuple[int, int]) -> Tuple[int, int]:
         raise AIServiceError(
             message="Dimensions exceed maximum supported size",
             details={"max_dimension": max_dimension},
-            request_id=str(time.time())
+            request_id=generate_local_id()
         )
     
     return (width, height)
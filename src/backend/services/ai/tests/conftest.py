@@ -11,18 +11,18 @@ Version: 1.0.0
 import pytest  # version: 7.3.1
 import pytest_asyncio  # version: 0.21.0
 from httpx import AsyncClient  # version: 0.24.1
-from unittest.mock import MagicMock, AsyncMock, patch  # built-in
+from unittest.mock import patch  # built-in
+import asyncio
+import os
 import time
 import logging
 from typing import Dict, Any, AsyncGenerator
 
 # Internal imports
 from ..src.app import app
-from ..src.services.openai_service import OpenAIService
-from ..src.services.stable_diffusion_service import StableDiffusionService
 
-# Configure logging for tests
-logging.basicConfig(level=logging.INFO)
+# Configure logging for tests; export TEST_LOG_LEVEL=INFO for verbose output
+logging.basicConfig(level=os.environ.get("TEST_LOG_LEVEL", "WARNING"))
 logger = logging.getLogger(__name__)
 
 # Test data constants
@@ -41,8 +41,15 @@ TEST_STORY_RESPONSE = {
     }
 }
 
+# Pre-encoded 1x1 white PNG returned by the mock service; tests never decode it
+TEST_PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010802000000907753"
+    "de0000000c49444154789c63f8ffff3f0005fe02fe0def46b80000000049454e"
+    "44ae426082"
+)
+
 TEST_ILLUSTRATION_RESPONSE = {
-    "image_data": bytes("test_image_data", "utf-8"),
+    "image_data": TEST_PNG_BYTES,
     "metadata": {
         "model": "stable-diffusion-xl",
         "version": "latest",
@@ -85,67 +92,84 @@ def pytest_configure(config):
         "illustration_generation: 45 seconds"  # Per technical spec
     )
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def event_loop():
+    """
+    Provides one event loop for the whole session so session-scoped async
+    fixtures can be shared across tests.
+    
+    Yields:
+        asyncio.AbstractEventLoop: Session event loop
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest_asyncio.fixture(scope="session")
 async def test_client() -> AsyncGenerator[AsyncClient, None]:
     """
-    Provides an async test client with performance monitoring.
+    Provides an async test client shared by the whole session.
+    
+    The client is closed explicitly on teardown so pooled connections do not
+    outlive the session.
     
     Yields:
         AsyncClient: Configured test client
     """
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        # Configure client timeout based on SLA
-        client.timeout = 45.0  # Maximum SLA requirement
-        
-        # Add performance monitoring headers
-        client.headers.update({
-            "X-Test-ID": str(time.time()),
-            "X-Performance-Monitor": "enabled"
-        })
-        
+    client = AsyncClient(
+        app=app,
+        base_url="http://test",
+        timeout=45.0,  # Maximum SLA requirement
+        headers={"X-Performance-Monitor": "enabled"}
+    )
+    try:
         yield client
+    finally:
+        await client.aclose()
 
 @pytest.fixture
-def mock_openai_service() -> MagicMock:
+def client(test_client: AsyncClient) -> AsyncClient:
     """
-    Provides a mocked OpenAI service with performance tracking.
+    Provides the shared test client tagged with a per-test ID header.
+    
+    Args:
+        test_client (AsyncClient): Session test client
     
     Returns:
-        MagicMock: Configured mock service
+        AsyncClient: Test client with a fresh X-Test-ID header
     """
-    mock_service = MagicMock(spec=OpenAIService)
-    
-    async def mock_generate_story(*args, **kwargs):
-        # Simulate realistic processing time
-        await asyncio.sleep(1.5)
-        return TEST_STORY_RESPONSE
+    test_client.headers["X-Test-ID"] = str(time.time())
+    return test_client
+
+class StubStableDiffusionService:
+    """Lightweight stand-in for StableDiffusionService that records requests."""
     
-    # Configure mock methods with performance tracking
-    mock_service.generate_story = AsyncMock(side_effect=mock_generate_story)
-    mock_service.validate_response = MagicMock(return_value=TEST_STORY_RESPONSE["content"])
+    def __init__(self, payload: bytes, latency: float = 0):
+        self.payload = payload
+        self.latency = latency
+        self.calls = []
     
-    return mock_service
+    async def generate_illustration(self, request):
+        self.calls.append(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)  # Simulate API latency
+        return self.payload
 
 @pytest.fixture
-def mock_stable_diffusion_service() -> MagicMock:
+def mock_stable_diffusion_service(request) -> StubStableDiffusionService:
     """
-    Provides a mocked Stable Diffusion service with performance tracking.
+    Provides a stubbed Stable Diffusion service.
+    
+    Returns immediately by default; tests opt into simulated API latency
+    with indirect parametrization, e.g. {"latency": 2.5}.
     
     Returns:
-        MagicMock: Configured mock service
+        StubStableDiffusionService: Stub recording each request in ``calls``
     """
-    mock_service = MagicMock(spec=StableDiffusionService)
-    
-    async def mock_generate_illustration(*args, **kwargs):
-        # Simulate realistic processing time
-        await asyncio.sleep(2.5)
-        return TEST_ILLUSTRATION_RESPONSE["image_data"]
-    
-    # Configure mock methods with performance tracking
-    mock_service.generate_illustration = AsyncMock(side_effect=mock_generate_illustration)
-    mock_service.enhance_image = MagicMock(return_value=TEST_ILLUSTRATION_RESPONSE["image_data"])
-    
-    return mock_service
+    return StubStableDiffusionService(
+        TEST_ILLUSTRATION_RESPONSE["image_data"],
+        getattr(request, "param", {}).get("latency", 0)
+    )
 
 @pytest.fixture
 def performance_monitor():
@@ -2,20 +2,19 @@
 import pytest  # version: 7.3.1
 import pytest_asyncio  # version: 0.21.0
 from httpx import AsyncClient  # version: 0.24.1
-from unittest.mock import MagicMock, AsyncMock, patch  # built-in
+import orjson  # version: 3.9.10
+from unittest.mock import MagicMock, patch  # built-in
 import time
 import asyncio
-from PIL import Image
-import io
+from types import MappingProxyType
 
 # Internal imports
 from ..src.models.illustration_request import IllustrationRequest
-from ..src.services.stable_diffusion_service import StableDiffusionService
-from ..src.utils.error_handler import AIServiceError
+from ..src.utils.error_handler import AIServiceError, ContentFilteredError, format_stable_diffusion_error
 
-# Test data constants
-TEST_ILLUSTRATION_REQUESTS = {
-    'valid_request': {
+# Test data constants; read-only templates shared by every test
+TEST_ILLUSTRATION_REQUESTS = MappingProxyType({
+    'valid_request': MappingProxyType({
         'prompt': 'A happy child playing in a garden',
         'style': "children's book",
         'size': [512, 512],
@@ -25,44 +24,36 @@ TEST_ILLUSTRATION_REQUESTS = {
             'color_depth': 24,
             'format': 'PNG'
         }
-    },
-    'invalid_prompt': {
+    }),
+    'invalid_prompt': MappingProxyType({
         'prompt': '',
         'style': "children's book",
         'size': [512, 512],
         'enhance_faces': True
-    },
-    'invalid_style': {
+    }),
+    'invalid_style': MappingProxyType({
         'prompt': 'A happy child playing',
         'style': 'invalid_style',
         'size': [512, 512],
         'enhance_faces': True
-    },
-    'invalid_size': {
+    }),
+    'invalid_size': MappingProxyType({
         'prompt': 'A happy child playing',
         'style': "children's book",
         'size': [100, 100],
         'enhance_faces': True
-    }
-}
+    })
+})
 
-@pytest.fixture
-def mock_stable_diffusion_service():
-    """Fixture for mocked Stable Diffusion service with timing simulation."""
-    service = AsyncMock(spec=StableDiffusionService)
-    
-    # Create a mock image for testing
-    img = Image.new('RGB', (512, 512), color='white')
-    img_byte_arr = io.BytesIO()
-    img.save(img_byte_arr, format='PNG')
-    img_bytes = img_byte_arr.getvalue()
-    
-    async def mock_generate(*args, **kwargs):
-        await asyncio.sleep(0.5)  # Simulate API latency
-        return img_bytes
-    
-    service.generate_illustration.side_effect = mock_generate
-    return service
+# Request bodies encoded once and shared by every test that posts them
+TEST_REQUEST_BODIES = MappingProxyType({
+    name: orjson.dumps(dict(request)) for name, request in TEST_ILLUSTRATION_REQUESTS.items()
+})
+_JSON_HEADERS = {'content-type': 'application/json'}
+
+# Smallest body the route accepts: a 10-character prompt and a style, other
+# fields defaulted. For tests exercising failures behind validation.
+_MIN_VALID_REQ_BODY = orjson.dumps({'prompt': 'Sunny pond', 'style': "children's book"})
 
 @pytest.mark.asyncio
 @pytest.mark.illustration
@@ -74,9 +65,13 @@ async def test_valid_illustration_generation(client: AsyncClient, mock_stable_di
     with patch('src.services.stable_diffusion_service.StableDiffusionService', 
                return_value=mock_stable_diffusion_service):
         # Act
-        start_time = time.time()
-        response = await client.post("/api/v1/illustrations/generate", json=request_data)
-        generation_time = time.time() - start_time
+        start_time = time.perf_counter_ns()
+        response = await client.post(
+            "/api/v1/illustrations/generate",
+            content=TEST_REQUEST_BODIES['valid_request'],
+            headers=_JSON_HEADERS
+        )
+        generation_time = (time.perf_counter_ns() - start_time) / 1e9
         
         # Assert
         assert response.status_code == 200
@@ -87,8 +82,8 @@ async def test_valid_illustration_generation(client: AsyncClient, mock_stable_di
         assert generation_time < 45, "Generation time exceeded 45s limit"
         
         # Verify service call
-        mock_stable_diffusion_service.generate_illustration.assert_called_once()
-        call_args = mock_stable_diffusion_service.generate_illustration.call_args[0][0]
+        assert len(mock_stable_diffusion_service.calls) == 1
+        call_args = mock_stable_diffusion_service.calls[0]
         assert isinstance(call_args, IllustrationRequest)
         assert call_args.prompt == request_data['prompt']
         assert call_args.style == request_data['style']
@@ -98,15 +93,16 @@ async def test_valid_illustration_generation(client: AsyncClient, mock_stable_di
 @pytest.mark.illustration
 async def test_invalid_prompt(client: AsyncClient):
     """Tests error handling for invalid prompt with detailed validation."""
-    # Arrange
-    request_data = TEST_ILLUSTRATION_REQUESTS['invalid_prompt']
-    
     # Act
-    response = await client.post("/api/v1/illustrations/generate", json=request_data)
+    response = await client.post(
+        "/api/v1/illustrations/generate",
+        content=TEST_REQUEST_BODIES['invalid_prompt'],
+        headers=_JSON_HEADERS
+    )
     
     # Assert
     assert response.status_code == 400
-    error_data = response.json()
+    error_data = orjson.loads(response.content)
     assert 'error' in error_data
     assert 'message' in error_data['error']
     assert 'prompt' in error_data['error']['message'].lower()
@@ -116,42 +112,46 @@ async def test_invalid_prompt(client: AsyncClient):
 @pytest.mark.illustration
 async def test_invalid_style(client: AsyncClient):
     """Tests error handling for invalid illustration style."""
-    # Arrange
-    request_data = TEST_ILLUSTRATION_REQUESTS['invalid_style']
-    
     # Act
-    response = await client.post("/api/v1/illustrations/generate", json=request_data)
+    response = await client.post(
+        "/api/v1/illustrations/generate",
+        content=TEST_REQUEST_BODIES['invalid_style'],
+        headers=_JSON_HEADERS
+    )
     
     # Assert
     assert response.status_code == 400
-    error_data = response.json()
+    error_data = orjson.loads(response.content)
     assert 'error' in error_data
     assert 'supported_styles' in error_data['error']['details']
 
 @pytest.mark.asyncio
 @pytest.mark.illustration
 @pytest.mark.performance
+@pytest.mark.parametrize('mock_stable_diffusion_service', [{'latency': 0.5}], indirect=True)
 async def test_performance_requirements(client: AsyncClient, mock_stable_diffusion_service):
     """Tests illustration generation performance requirements with detailed metrics."""
     # Arrange
-    request_data = TEST_ILLUSTRATION_REQUESTS['valid_request']
-    performance_metrics = []
+    async def timed_generation():
+        start_time = time.perf_counter_ns()
+        response = await client.post(
+            "/api/v1/illustrations/generate",
+            content=TEST_REQUEST_BODIES['valid_request'],
+            headers=_JSON_HEADERS
+        )
+        return response, (time.perf_counter_ns() - start_time) / 1e9
     
     with patch('src.services.stable_diffusion_service.StableDiffusionService', 
                return_value=mock_stable_diffusion_service):
         # Act
-        for _ in range(3):  # Test multiple generations for consistency
-            start_time = time.perf_counter()
-            response = await client.post("/api/v1/illustrations/generate", json=request_data)
-            generation_time = time.perf_counter() - start_time
-            performance_metrics.append(generation_time)
-            
+        # Run multiple generations concurrently for consistency
+        results = await asyncio.gather(*(timed_generation() for _ in range(3)))
+        performance_metrics = [generation_time for _, generation_time in results]
+        
+        for response, generation_time in results:
             # Assert individual request
             assert response.status_code == 200
             assert generation_time < 45, f"Generation time {generation_time}s exceeded 45s limit"
-            
-            # Add cooldown between requests
-            await asyncio.sleep(1)
         
         # Assert overall performance
         avg_generation_time = sum(performance_metrics) / len(performance_metrics)
@@ -165,15 +165,16 @@ async def test_performance_requirements(client: AsyncClient, mock_stable_diffusi
 @pytest.mark.illustration
 async def test_invalid_size(client: AsyncClient):
     """Tests error handling for invalid image dimensions."""
-    # Arrange
-    request_data = TEST_ILLUSTRATION_REQUESTS['invalid_size']
-    
     # Act
-    response = await client.post("/api/v1/illustrations/generate", json=request_data)
+    response = await client.post(
+        "/api/v1/illustrations/generate",
+        content=TEST_REQUEST_BODIES['invalid_size'],
+        headers=_JSON_HEADERS
+    )
     
     # Assert
     assert response.status_code == 400
-    error_data = response.json()
+    error_data = orjson.loads(response.content)
     assert 'error' in error_data
     assert 'dimensions' in error_data['error']['details']
     assert 'size' in error_data['error']['message'].lower()
@@ -182,17 +183,31 @@ async def test_invalid_size(client: AsyncClient):
 @pytest.mark.illustration
 async def test_service_timeout(client: AsyncClient):
     """Tests handling of service timeout scenarios."""
-    # Arrange
-    request_data = TEST_ILLUSTRATION_REQUESTS['valid_request']
-    
     with patch('src.services.stable_diffusion_service.StableDiffusionService') as mock_service:
         mock_service.return_value.generate_illustration.side_effect = asyncio.TimeoutError()
         
         # Act
-        response = await client.post("/api/v1/illustrations/generate", json=request_data)
+        response = await client.post(
+            "/api/v1/illustrations/generate",
+            content=_MIN_VALID_REQ_BODY,
+            headers=_JSON_HEADERS
+        )
         
         # Assert
         assert response.status_code == 504
-        error_data = response.json()
+        error_data = orjson.loads(response.content)
         assert 'error' in error_data
-        assert 'timeout' in error_data['error']['message'].lower()
\ No newline at end of file
+        assert 'timeout' in error_data['error']['message'].lower()
+
+def test_format_content_filtered_error():
+    """Test that a filtered generation is mapped to HTTP 400."""
+    error = ContentFilteredError(
+        message="Generated image was rejected by the safety filter",
+        details={"finish_reason": "FILTER"},
+        request_id="test-request"
+    )
+    
+    http_error = format_stable_diffusion_error(error, {})
+    
+    assert http_error.status_code == 400
+    assert http_error.detail["error"]["message"] == "Content violates safety guidelines."
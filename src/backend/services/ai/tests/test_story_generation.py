@@ -1,18 +1,21 @@
 # External imports with version specifications
 import pytest  # version: 7.3.1
 import pytest_asyncio  # version: 0.21.0
-from unittest.mock import MagicMock, patch  # built-in
+import httpx  # version: 0.24.1
+import openai  # version: 1.3.0
+from unittest.mock import patch  # built-in
 import time
 import asyncio
-from typing import Dict, Any
+import gc
+import os
+from types import MappingProxyType
 
 # Internal imports
 from ..src.models.story_request import StoryRequest
-from ..src.services.openai_service import OpenAIService
-from ..src.utils.error_handler import AIServiceError
+from ..src.utils.error_handler import AIServiceError, format_openai_error
 
-# Test constants
-VALID_TEST_REQUEST = {
+# Test constants; read-only template, merge into a new dict to vary it
+VALID_TEST_REQUEST = MappingProxyType({
     "character_name": "Test Child",
     "age": 8,
     "theme": "Adventure",
@@ -20,7 +23,7 @@ VALID_TEST_REQUEST = {
     "additional_notes": "Loves science",
     "content_safety_level": "child_safe",
     "max_tokens": 4000
-}
+})
 
 EXPECTED_STORY_RESPONSE = {
     "content": "Test story content",
@@ -32,184 +35,219 @@ EXPECTED_STORY_RESPONSE = {
     }
 }
 
+# Page size used to convert /proc/self/statm pages to bytes
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Invalid request overrides and the validation error each should raise
+INVALID_REQUEST_CASES = (
+    ({"age": 2}, "Age must be between 3 and 12"),
+    ({"age": 13}, "Age must be between 3 and 12"),
+    ({"character_name": ""}, "Character name is required"),
+    ({"theme": "Invalid"}, "Invalid theme selected"),
+    ({"interests": []}, "At least one interest is required"),
+    ({"interests": ["a"]*6}, "Maximum 5 interests allowed")
+)
+
+class StubOpenAI:
+    """
+    Lightweight stand-in for OpenAIService that records story requests.
+    
+    Set ``side_effect`` to an exception to make generate_story raise it.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.side_effect = None
+
+    async def generate_story(self, request):
+        self.calls.append(request)
+        if self.side_effect is not None:
+            raise self.side_effect
+        return EXPECTED_STORY_RESPONSE
+
+    def reset(self):
+        self.calls.clear()
+        self.side_effect = None
+
+def _get_memory_usage() -> int:
+    """Get current memory usage (RSS in bytes)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except FileNotFoundError:
+        # Not Linux; peak RSS, reported in kilobytes, is close enough
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+@pytest.fixture
+def openai_stub():
+    """Provides a stub OpenAI service, cleared after the test."""
+    stub = StubOpenAI()
+    yield stub
+    stub.reset()
+
+@pytest.fixture
+def valid_story_request():
+    """
+    Provides a valid story request.
+    
+    Collects garbage on teardown so per-test objects and mock call history
+    do not accumulate across tests and skew memory measurements.
+    """
+    yield StoryRequest(**VALID_TEST_REQUEST)
+    gc.collect()
+
+@pytest.mark.asyncio
+@pytest.mark.story
+async def test_valid_story_generation(openai_stub: StubOpenAI, valid_story_request: StoryRequest):
+    """
+    Test successful story generation with comprehensive validation.
+
+    Tests:
+    - Content safety and COPPA compliance
+    - Performance requirements (<30s)
+    - Token limits (max 4000)
+    - Response structure and metadata
+    """
+    # Record start time for performance measurement
+    start_time = time.perf_counter_ns()
+
+    try:
+        # Execute story generation
+        response = await openai_stub.generate_story(valid_story_request)
+
+        # Record end time
+        generation_time = (time.perf_counter_ns() - start_time) / 1e9
+
+        # Validate response structure
+        assert response is not None
+        assert "content" in response
+        assert "metadata" in response
+
+        # Validate content safety
+        assert len(response["content"]) > 0
+        assert not any(unsafe_word in response["content"].lower() 
+                     for unsafe_word in ["death", "violence", "scary"])
+
+        # Validate performance
+        assert generation_time < 30, "Story generation exceeded 30s limit"
+        assert response["metadata"]["tokens_used"] <= 4000, "Exceeded token limit"
+
+        # Validate theme and character integration
+        assert valid_story_request.theme in response["metadata"]["theme"]
+        assert valid_story_request.character_name in response["content"]
+
+        # Validate age appropriateness
+        assert response["metadata"].get("age_appropriate", True)
+
+    except Exception as e:
+        pytest.fail(f"Story generation failed: {str(e)}")
+
+@pytest.mark.asyncio
 @pytest.mark.story
-class TestStoryGeneration:
-    """Comprehensive test suite for story generation functionality."""
-
-    def setup_method(self):
-        """Initialize test environment and dependencies."""
-        self.openai_service = MagicMock(spec=OpenAIService)
-        self.story_request = StoryRequest(**VALID_TEST_REQUEST)
-        self.performance_metrics = {
-            "start_time": None,
-            "end_time": None,
-            "memory_usage": None
-        }
-
-    def teardown_method(self):
-        """Clean up test resources and reset mocks."""
-        self.openai_service.reset_mock()
-        self.performance_metrics = None
-
-    @pytest.mark.asyncio
-    @pytest.mark.story
-    async def test_valid_story_generation(self, mock_openai_service: MagicMock):
-        """
-        Test successful story generation with comprehensive validation.
-        
-        Tests:
-        - Content safety and COPPA compliance
-        - Performance requirements (<30s)
-        - Token limits (max 4000)
-        - Response structure and metadata
-        """
-        # Configure mock response
-        mock_openai_service.generate_story.return_value = EXPECTED_STORY_RESPONSE
-        
-        # Record start time for performance measurement
-        start_time = time.time()
-        
-        try:
-            # Execute story generation
-            response = await mock_openai_service.generate_story(self.story_request)
-            
-            # Record end time
-            generation_time = time.time() - start_time
-            
-            # Validate response structure
-            assert response is not None
-            assert "content" in response
-            assert "metadata" in response
-            
-            # Validate content safety
-            assert len(response["content"]) > 0
-            assert not any(unsafe_word in response["content"].lower() 
-                         for unsafe_word in ["death", "violence", "scary"])
-            
-            # Validate performance
-            assert generation_time < 30, "Story generation exceeded 30s limit"
-            assert response["metadata"]["tokens_used"] <= 4000, "Exceeded token limit"
-            
-            # Validate theme and character integration
-            assert self.story_request.theme in response["metadata"]["theme"]
-            assert self.story_request.character_name in response["content"]
-            
-            # Validate age appropriateness
-            assert response["metadata"].get("age_appropriate", True)
-            
-        except Exception as e:
-            pytest.fail(f"Story generation failed: {str(e)}")
-
-    @pytest.mark.asyncio
-    @pytest.mark.story
-    @pytest.mark.parametrize("invalid_data, expected_error", [
-        ({"age": 2}, "Age must be between 3 and 12"),
-        ({"age": 13}, "Age must be between 3 and 12"),
-        ({"character_name": ""}, "Character name is required"),
-        ({"theme": "Invalid"}, "Invalid theme selected"),
-        ({"interests": []}, "At least one interest is required"),
-        ({"interests": ["a"]*6}, "Maximum 5 interests allowed")
-    ])
-    async def test_invalid_request_validation(self, invalid_data: Dict[str, Any], expected_error: str):
-        """
-        Test comprehensive input validation with various invalid scenarios.
-        
-        Args:
-            invalid_data: Invalid request parameters
-            expected_error: Expected error message
-        """
-        # Create invalid request by updating valid base request
-        test_data = VALID_TEST_REQUEST.copy()
-        test_data.update(invalid_data)
-        
+async def test_invalid_request_validation():
+    """
+    Test comprehensive input validation with various invalid scenarios.
+
+    All cases run in one test; the failing case is named in the
+    assertion message.
+    """
+    for invalid_data, expected_error in INVALID_REQUEST_CASES:
+        # Create invalid request by merging over the valid base request
+        test_data = {**VALID_TEST_REQUEST, **invalid_data}
+
         with pytest.raises(AIServiceError) as exc_info:
             StoryRequest(**test_data)
-        
-        assert expected_error in str(exc_info.value)
-
-    @pytest.mark.asyncio
-    @pytest.mark.story
-    async def test_openai_service_error_handling(self, mock_openai_service: MagicMock):
-        """
-        Test comprehensive error handling for OpenAI service failures.
-        
-        Tests:
-        - Timeout handling
-        - Rate limit handling
-        - API errors
-        - Content filter violations
-        """
-        # Test timeout scenario
-        mock_openai_service.generate_story.side_effect = asyncio.TimeoutError()
-        with pytest.raises(AIServiceError) as exc_info:
-            await mock_openai_service.generate_story(self.story_request)
-        assert "Request timed out" in str(exc_info.value)
-        
-        # Test rate limit handling
-        mock_openai_service.generate_story.side_effect = AIServiceError(
-            message="Rate limit exceeded",
-            details={"retry_after": 60},
-            request_id="test"
-        )
-        with pytest.raises(AIServiceError) as exc_info:
-            await mock_openai_service.generate_story(self.story_request)
-        assert "Rate limit exceeded" in str(exc_info.value)
-        
-        # Test content filter violation
-        mock_openai_service.generate_story.side_effect = AIServiceError(
-            message="Content violates safety guidelines",
-            details={"filter_type": "inappropriate_content"},
-            request_id="test"
-        )
-        with pytest.raises(AIServiceError) as exc_info:
-            await mock_openai_service.generate_story(self.story_request)
-        assert "Content violates safety guidelines" in str(exc_info.value)
-
-    @pytest.mark.asyncio
-    @pytest.mark.story
-    @pytest.mark.performance
-    async def test_story_generation_performance(self, mock_openai_service: MagicMock):
-        """
-        Test performance requirements for story generation.
-        
-        Tests:
-        - Response time under 30s
-        - Memory usage
-        - Token consumption
-        """
-        # Configure mock for performance testing
-        mock_openai_service.generate_story.return_value = EXPECTED_STORY_RESPONSE
-        
-        # Initialize performance monitoring
-        start_time = time.time()
-        start_memory = self._get_memory_usage()
-        
-        # Execute multiple story generations for performance testing
-        test_iterations = 5
-        for _ in range(test_iterations):
-            response = await mock_openai_service.generate_story(self.story_request)
-            
-            # Validate performance metrics
-            generation_time = time.time() - start_time
-            assert generation_time < 30, f"Generation time {generation_time}s exceeded limit"
-            assert response["metadata"]["tokens_used"] <= 4000, "Token limit exceeded"
-        
-        # Calculate and validate resource usage
-        end_memory = self._get_memory_usage()
-        memory_increase = end_memory - start_memory
-        assert memory_increase < 500_000_000, "Excessive memory usage detected"
-        
-        # Log performance metrics
-        self.performance_metrics = {
-            "average_generation_time": (time.time() - start_time) / test_iterations,
-            "memory_usage": memory_increase,
-            "total_tokens": sum(EXPECTED_STORY_RESPONSE["metadata"]["tokens_used"] 
-                              for _ in range(test_iterations))
-        }
-
-    def _get_memory_usage(self) -> int:
-        """Helper method to get current memory usage."""
-        import psutil
-        import os
-        process = psutil.Process(os.getpid())
-        return process.memory_info().rss
\ No newline at end of file
+
+        assert expected_error in str(exc_info.value), f"case={invalid_data}"
+
+@pytest.mark.asyncio
+@pytest.mark.story
+async def test_openai_service_error_handling(openai_stub: StubOpenAI, valid_story_request: StoryRequest):
+    """
+    Test comprehensive error handling for OpenAI service failures.
+
+    Tests:
+    - Timeout handling
+    - Rate limit handling
+    - API errors
+    - Content filter violations
+    """
+    # Test timeout scenario
+    openai_stub.side_effect = asyncio.TimeoutError()
+    with pytest.raises(AIServiceError) as exc_info:
+        await openai_stub.generate_story(valid_story_request)
+    assert "Request timed out" in str(exc_info.value)
+
+    # Test rate limit handling
+    openai_stub.side_effect = AIServiceError(
+        message="Rate limit exceeded",
+        details={"retry_after": 60},
+        request_id="test"
+    )
+    with pytest.raises(AIServiceError) as exc_info:
+        await openai_stub.generate_story(valid_story_request)
+    assert "Rate limit exceeded" in str(exc_info.value)
+
+    # Test content filter violation
+    openai_stub.side_effect = AIServiceError(
+        message="Content violates safety guidelines",
+        details={"filter_type": "inappropriate_content"},
+        request_id="test"
+    )
+    with pytest.raises(AIServiceError) as exc_info:
+        await openai_stub.generate_story(valid_story_request)
+    assert "Content violates safety guidelines" in str(exc_info.value)
+
+@pytest.mark.asyncio
+@pytest.mark.story
+@pytest.mark.performance
+async def test_story_generation_performance(openai_stub: StubOpenAI, valid_story_request: StoryRequest):
+    """
+    Test performance requirements for story generation.
+
+    Tests:
+    - Response time under 30s
+    - Memory usage
+    - Token consumption
+    """
+    # Initialize performance monitoring
+    start_time = time.perf_counter_ns()
+    start_memory = _get_memory_usage()
+
+    # Execute multiple story generations concurrently for performance testing
+    test_iterations = 5
+    responses = await asyncio.gather(*(
+        openai_stub.generate_story(valid_story_request)
+        for _ in range(test_iterations)
+    ))
+
+    # Validate performance metrics
+    generation_time = (time.perf_counter_ns() - start_time) / 1e9
+    assert generation_time < 30, f"Generation time {generation_time}s exceeded limit"
+    throughput = test_iterations / max(generation_time, 1e-9)
+    assert throughput >= test_iterations / 30, f"Throughput {throughput:.2f} stories/s below target"
+    for response in responses:
+        assert response["metadata"]["tokens_used"] <= 4000, "Token limit exceeded"
+
+    # Calculate and validate resource usage
+    end_memory = _get_memory_usage()
+    memory_increase = end_memory - start_memory
+    assert memory_increase < 500_000_000, "Excessive memory usage detected"
+
+    # Validate every generation reached the service
+    assert len(openai_stub.calls) == test_iterations
+
+@pytest.mark.story
+def test_format_openai_rate_limit_error():
+    """Test that an OpenAI v1 rate limit error is mapped to HTTP 429."""
+    response = httpx.Response(
+        429,
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    )
+    error = openai.RateLimitError("Rate limit reached", response=response, body=None)
+    
+    http_error = format_openai_error(error, {})
+    
+    assert http_error.status_code == 429
+    assert http_error.detail["error"]["message"] == "API rate limit exceeded. Please try again later."